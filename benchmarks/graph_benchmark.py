@@ -0,0 +1,71 @@
+"""Benchmark of the interaction graph on a synthetic group.
+
+Usage:
+    python benchmarks/graph_benchmark.py --users 300000 --reactions 2000000
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from halloffame.graph import InteractionGraph, REACTIONS, get_graph_stats
+
+
+def timeit(name, function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    print(f"{name:<32} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def synthetic_edges(num_users, num_reactions, seed=0):
+    """Generate reactions where a few users publish and react a lot (Zipf distribution)."""
+    rng = np.random.default_rng(seed)
+    reactors = (rng.zipf(1.5, num_reactions) - 1) % num_users
+    authors = (rng.zipf(1.3, num_reactions) - 1) % num_users
+    reactions = rng.integers(0, len(REACTIONS), num_reactions)
+    return reactors, authors, reactions
+
+
+def synthetic_posts(num_users, num_reactions, reactions_per_post=50, seed=0):
+    """Generate posts, in the same format as ``HallOfFameAPI.get_posts()``."""
+    reactors, authors, reactions = synthetic_edges(num_users, num_reactions, seed=seed)
+    posts = []
+    for start in range(0, num_reactions, reactions_per_post):
+        posts.append({
+            "user": f"user-{authors[start]}",
+            "reactions": [{"user": f"user-{reactor}", "reaction": REACTIONS[reaction]}
+                          for reactor, reaction in zip(reactors[start:start + reactions_per_post],
+                                                       reactions[start:start + reactions_per_post])],
+            "comments": []
+        })
+    return posts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark of the interaction graph.")
+    parser.add_argument("--users", type=int, default=300000)
+    parser.add_argument("--reactions", type=int, default=2000000)
+    parser.add_argument("--posts-reactions", type=int, default=500000,
+                        help="Number of reactions used to benchmark the graph creation from posts.")
+    args = parser.parse_args()
+
+    print(f"{args.users} users, {args.reactions} reactions")
+    reactors, authors, reactions = synthetic_edges(args.users, args.reactions)
+    users = [f"user-{index}" for index in range(args.users)]
+    graph = timeit("InteractionGraph.from_edges", InteractionGraph.from_edges, reactors, authors, reactions, users)
+    timeit("matrix (all reactions)", graph.matrix)
+    timeit("top_pairs", graph.top_pairs, k=10)
+    timeit("mutual_pairs", graph.mutual_pairs, k=10)
+    timeit("biggest_fans", graph.biggest_fans, k=10)
+    timeit("reciprocity", graph.reciprocity)
+    timeit("user_reciprocity", graph.user_reciprocity, k=10)
+    timeit("get_graph_stats", get_graph_stats, graph)
+
+    print(f"\n{args.posts_reactions} reactions, from posts")
+    posts = synthetic_posts(args.users, args.posts_reactions)
+    graph = timeit("InteractionGraph.from_posts", InteractionGraph.from_posts, posts)
+    timeit("get_graph_stats", get_graph_stats, graph)
@@ -10,3 +10,7 @@
 from .api import HallOfFameAPI
 from .template import apply_template, apply_fonts_template, apply_font, apply_stats_template
 from .stats import get_top_stats, get_user_stats
+from .scheduler import RefreshScheduler
+from .planner import plan_scrape, get_template_keys
+from .graph import InteractionGraph, get_graph_stats
+from .sketch import ApproximateStats
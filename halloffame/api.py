@@ -8,6 +8,12 @@
 
 
 import time
+import json
+import urllib.request
+from urllib.parse import urljoin
+from collections import deque, defaultdict
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
 from bs4 import BeautifulSoup
 from selenium import webdriver
@@ -15,7 +21,11 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
-from .utils import xpath_soup, convert_date
+from .utils import xpath_soup, convert_date, get_post_id, is_login_url
+from .parser import parse_reactions, parse_permalink, parse_comment_page, parse_reaction_count, is_comment_page
+from .pipeline import ParsePipeline
+from .comments import CommentThread
+from .scripts import EXTRACT_REACTIONS
 
 
 class HallOfFameAPI:
@@ -38,6 +48,15 @@ class HallOfFameAPI:
 
     * :attr:`class2reaction` (dict): Dictionary mapping classes to their reaction. E.g. ``"sx_973dvziD"`` may link to the reaction ``"AHAH"``.
         Note that reaction classes always start with ``"sx_"``.
+
+    * :attr:`extraction` (str): How reactions are extracted from the pages. With ``"soup"``, the whole page is transferred
+        and parsed with ``BeautifulSoup``. With ``"script"``, a JavaScript extractor runs in the browser and only returns
+        the reactions loaded since its last call, which is faster on large reaction pages.
+
+    * :attr:`page_loads` (int): Number of pages loaded by the driver.
+
+    * :attr:`missing_pages` (list): Links to the comment and reply pages that could not be fetched.
+        If a link was added while retrieving a post, its comments are incomplete.
         
     .. note::
         You should provide the ``reaction2href`` data. To do so, simply create posts with you facebook account, 
@@ -51,11 +70,29 @@ class HallOfFameAPI:
     BASE_URL = "https://m.facebook.com"
     LOGIN_URL = "https://mbasic.facebook.com"
 
-    def __init__(self, executable_path="geckodriver.exe", reaction2href={}):
+    def __init__(self, executable_path="geckodriver.exe", reaction2href={}, extraction="soup"):
+        if extraction not in ["soup", "script"]:
+            raise ValueError(f"Unknown extraction {extraction}. Available options are within {{'soup', 'script'}}.")
         self.executable_path = executable_path
         self.driver = webdriver.Firefox(executable_path=executable_path)
         self.reaction2href = reaction2href
         self.class2reaction = {}
+        self.extraction = extraction
+        self.page_loads = 0
+        self.missing_pages = []
+
+    def _get(self, url):
+        """Load a page with the driver, and keep track of the number of page loads.
+
+        Args:
+            url (str): URL of the page to load.
+        """
+        self.page_loads += 1
+        self.driver.get(url)
+
+    def _get_soup(self):
+        """Parse the current page with ``BeautifulSoup``."""
+        return BeautifulSoup(self.driver.page_source, 'lxml')
 
     def login(self, email, password):
         self._login(email, password)
@@ -81,7 +118,7 @@ class HallOfFameAPI:
 
     def _get_reaction_class(self, href):
         # Connect to a single reaction page
-        self.driver.get(f"https://m.facebook.com/{href}")
+        self._get(f"https://m.facebook.com/{href}")
         page = self.driver.page_source
         soup = BeautifulSoup(page, 'lxml')
         # Get the emoji
@@ -129,54 +166,96 @@ class HallOfFameAPI:
                 break
             last_height = new_height
 
-    def get_reactions(self, post_id):
-        """Get the reaction from a page's post.
+    def _open_reactions(self, post_id):
+        """Open the reaction browser of a post.
 
         Args:
-            driver (selenium.webdriver.firefox.webdriver.WebDriver): WebDriver connected to the post page.
-                The current supported driver is only limited to Firefox.
+            post_id (str): ID of the post (or comment, reply).
 
         Returns:
-            list: list of reactions (dict) conaining the user and reaction.
+            int: the total number of reactions.
         """
-        self.driver.get(f"{self.BASE_URL}/ufi/reaction/profile/browser/?ft_ent_identifier={post_id}")
-        page = self.driver.page_source
-        soup = BeautifulSoup(page, 'lxml')
+        self._get(f"{self.BASE_URL}/ufi/reaction/profile/browser/?ft_ent_identifier={post_id}")
         # get the total number of reactions
         try:
-            num_reactions = int(soup.find("span", {"data-sigil": "reaction_profile_sigil"}).text.split(" ")[1])
-        except IndexError:
-            num_reactions = 0
+            num_reactions_text = self.driver.find_element_by_css_selector('span[data-sigil="reaction_profile_sigil"]').text
+            return int(num_reactions_text.split(" ")[1])
+        except Exception:
+            return 0
+
+    def _load_more_reactions(self):
+        """Load the next page of reactions in the reaction browser.
+
+        Returns:
+            bool: ``True`` if more reactions were loaded, ``False`` if all reactions are already loaded.
+        """
+        try:
+            # Find the "load more" button, and click
+            load_more = WebDriverWait(self.driver, 5).until(EC.element_to_be_clickable((By.CSS_SELECTOR, ".primarywrap strong")))
+            load_more.click()
+            # One scroll down to go to the next "load more" button, if any
+            self.scroll_end(sleep=3, scroll_max=None)
+            return True
+        except Exception:
+            return False
+
+    def _load_reactions(self, post_id):
+        """Load all the reactions of a post in the reaction browser.
+
+        Args:
+            post_id (str): ID of the post (or comment, reply).
+
+        Returns:
+            str: the HTML source of the reaction browser page.
+        """
+        num_reactions = self._open_reactions(post_id)
         # If > 50 reactions, load all the pages of reactions (scroll down + load more button)
         if num_reactions > 50:
-            while True:
-                try:
-                    # Find the "load more" button, and click
-                    load_more_soup = soup.select(".primarywrap strong")[0]
-                    load_more = WebDriverWait(self.driver, 5).until(EC.element_to_be_clickable((By.XPATH, xpath_soup(load_more_soup))))
-                    load_more.click()
-                    # One scroll down to go to the next "load more" button, if any
-                    self.scroll_end(sleep=3, scroll_max=None)
-                except Exception:
-                    break
-            # Load the entire page with Beautiful Soup
-            page = self.driver.page_source
-            soup = BeautifulSoup(page, 'lxml')
+            while self._load_more_reactions():
+                continue
+        return self.driver.page_source
+
+    def _extract_reactions(self, post_id):
+        """Extract all the reactions of a post in the browser, with the JavaScript extractor.
+        Only the reactions loaded after each "load more" click are transferred.
+
+        Args:
+            post_id (str): ID of the post (or comment, reply).
+
+        Returns:
+            list: list of reactions (dict) containing the user, its id and the classes of the reaction emoji.
+        """
+        num_reactions = self._open_reactions(post_id)
+        rows = self._run_extractor(EXTRACT_REACTIONS, post_id)
+        if num_reactions > 50:
+            while self._load_more_reactions():
+                rows.extend(self._run_extractor(EXTRACT_REACTIONS, post_id))
+        return [{"user": user, "user_id": user_id, "classes": classes} for user, user_id, classes in rows]
+
+    def _run_extractor(self, script, post_id):
+        """Run a JavaScript extractor, and raise an error if some items could not be extracted,
+        as the ``BeautifulSoup`` parsers do."""
+        result = self.driver.execute_script(script)
+        if result["errors"]:
+            raise ValueError(f"Could not extract {len(result['errors'])} item(s) of {post_id}: {result['errors'][0]}")
+        return result["rows"]
+
+    def _resolve_reactions(self, raw_reactions):
+        """Convert the emoji classes of parsed reactions to their reaction type.
 
-        # Load the item (content of the reaction)
-        raw_reactions = soup.select(".item")
+        Args:
+            raw_reactions (list): Reactions parsed with ``parse_reactions()``.
+
+        Returns:
+            list: list of reactions (dict) conaining the user and reaction.
+        """
         reactions = []
-        for reaction in raw_reactions:
-            # Get the name of the person who reacted
-            user = reaction.select("span strong")[0].text
-            user_id = reaction.select("a")[0].get("href").split("/")[1].split("&")[0].split("?groupid")[0]
-            # Find the reaction emoji
-            react_classes = reaction.parent.select("i.img._59aq")[0].get("class")
+        for raw_reaction in raw_reactions:
             # Convert the emoji class to id
             react_type = None
             # While loop in case the ids changed (facebook change id, for security reasons)
             while react_type is None:
-                for react_class in react_classes:
+                for react_class in raw_reaction["classes"]:
                     if react_class in self.class2reaction.keys():
                         react_type = self.class2reaction[react_class]
                 # If ids changed, update the reaction to class dict
@@ -184,12 +263,26 @@ class HallOfFameAPI:
                     self.init_reactions()
             # Add the reaction
             reactions.append({
-                "user": user,
-                "user_id": user_id,
+                "user": raw_reaction["user"],
+                "user_id": raw_reaction["user_id"],
                 "reaction": react_type
             })
         return reactions
 
+    def get_reactions(self, post_id):
+        """Get the reaction from a page's post.
+
+        Args:
+            post_id (str): ID of the post (or comment, reply).
+
+        Returns:
+            list: list of reactions (dict) conaining the user and reaction.
+        """
+        if self.extraction == "script":
+            return self._resolve_reactions(self._extract_reactions(post_id))
+        page = self._load_reactions(post_id)
+        return self._resolve_reactions(parse_reactions(page))
+
     def _unfold_comments(self):
         """Function used to unfold all discussions from a thread.
 
@@ -201,81 +294,138 @@ class HallOfFameAPI:
         for comment in unfolded_comments:
             comment.click()
 
-    def get_comments(self, group_id, post_id):
+    def _load_comments(self, group_id, post_id):
+        """Load and unfold the comments of a post.
+
+        Returns:
+            str: the HTML source of the permalink page.
+        """
+        self._get(f"{self.BASE_URL}/groups/{group_id}/permalink/{post_id}/?anchor_composer=false")
+        self._unfold_comments()
+        return self.driver.page_source
+
+    def _get_comments_reactions(self, comments, mode="full"):
+        """Retrieve the reactions of parsed comments and replies, in place."""
+        for comment in comments:
+            for item in [comment, *comment["replies"]]:
+                reactions_id = item.pop("reactions_id")
+                if mode == "full" and reactions_id is not None:
+                    item["reactions"] = self.get_reactions(reactions_id)
+        return comments
+
+    def _fetch_pages(self, hrefs, workers=4, retries=1):
+        """Fetch pages of comments or replies concurrently, with the session of the driver.
+        The pages that still cannot be fetched after the retries are loaded with the driver.
+        A page redirected to the login or checkpoint page, or without any comment, is not fetched.
+
+        Args:
+            hrefs (list): Links to the pages, relative to ``BASE_URL``.
+            workers (int, optional): Number of pages fetched at the same time. Defaults to ``4``.
+            retries (int, optional): Number of times a page is fetched again after an error. Defaults to ``1``.
+
+        Returns:
+            list: the HTML source of the pages, or ``None`` for the pages that could not be fetched.
+        """
+        cookies = "; ".join(f"{cookie['name']}={cookie['value']}" for cookie in self.driver.get_cookies())
+        user_agent = self.driver.execute_script("return navigator.userAgent")
+
+        def fetch(href):
+            request = urllib.request.Request(urljoin(self.BASE_URL, href), headers={"Cookie": cookies, "User-Agent": user_agent})
+            for _ in range(retries + 1):
+                try:
+                    with urllib.request.urlopen(request, timeout=30) as response:
+                        url = response.geturl()
+                        page = response.read().decode("utf-8", errors="replace")
+                except Exception:
+                    continue
+                # The session was rejected: retrying will not help
+                if is_login_url(url) or not is_comment_page(page):
+                    return None
+                return page
+            return None
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pages = list(executor.map(fetch, hrefs))
+        self.page_loads += sum(page is not None for page in pages)
+        # Fall back to the driver, which is slower but handles the redirections and javascript challenges.
+        # These pages are counted by ``_get()``.
+        for index, href in enumerate(hrefs):
+            if pages[index] is None:
+                try:
+                    self._get(urljoin(self.BASE_URL, href))
+                    if not is_login_url(self.driver.current_url) and is_comment_page(self.driver.page_source):
+                        pages[index] = self.driver.page_source
+                except Exception:
+                    continue
+        return pages
+
+    def _paginate_comments(self, comments, links, max_pages=None, max_depth=None, max_comments=None, workers=4, replies=True):
+        """Follow the comment and reply pagination links, until the thread is exhausted or the budget is reached.
+
+        Args:
+            comments (list): Comments parsed from the permalink page.
+            links (list): Pagination links parsed from the permalink page.
+            max_pages (int, optional): Maximum number of pages to fetch. If ``None``, no limit. Defaults to ``None``.
+            max_depth (int, optional): Maximum number of successive links to follow from the permalink page.
+                If ``None``, no limit. Defaults to ``None``.
+            max_comments (int, optional): Stop once this number of comments and replies is collected.
+                If ``None``, no limit. Defaults to ``None``.
+            workers (int, optional): Number of pages fetched at the same time. Defaults to ``4``.
+            replies (bool, optional): If ``False``, the "View more replies" pages are not followed. Defaults to ``True``.
+
+        Returns:
+            list: the comments, updated in place. Duplicated comments and replies are removed.
+                The links to the pages that could not be fetched are added to ``missing_pages``.
+        """
+        thread = CommentThread(comments, links, max_pages=max_pages, max_depth=max_depth, max_comments=max_comments,
+                               replies=replies)
+        batch = thread.next_batch()
+        while batch:
+            pages = self._fetch_pages([link["href"] for link, _ in batch], workers=workers)
+            for (link, depth), page in zip(batch, pages):
+                if page is None:
+                    thread.add_missing(link)
+                    continue
+                thread.add_page(link, depth, parse_comment_page(page, parent_id=link["parent_id"]))
+            batch = thread.next_batch()
+        self.missing_pages.extend(thread.missing)
+        return comments
+
+    def get_comments(self, group_id, post_id, mode="full", max_pages=None, max_depth=None, max_comments=None, workers=4,
+                     replies=True):
         """Retrieve all comments from a page post.
+        The "View previous comments" and "View more replies" pages are followed until the thread is exhausted,
+        or until the budget (``max_pages``, ``max_depth``, ``max_comments``) is reached.
 
         Args:
-            driver (selenium.webdriver.firefox.webdriver.WebDriver): WebDriver connected to the post page.
-                The current supported driver is only limited to Firefox.
+            group_id (str): ID of the group of the post.
+            post_id (str): ID of the post.
+            mode (str, optional): If ``"full"``, retrieve the list of reactions of all comments and replies.
+                If ``"counts"``, only read their number of reactions (``"reaction_count"``) from the post page.
+                Defaults to ``"full"``.
+            max_pages (int, optional): Maximum number of comment pages to fetch, in addition to the post page.
+                If ``None``, no limit. Defaults to ``None``.
+            max_depth (int, optional): Maximum number of successive comment pages to follow. If ``None``, no limit.
+                Defaults to ``None``.
+            max_comments (int, optional): Stop fetching comment pages once this number of comments and replies is collected.
+                If ``None``, no limit. Defaults to ``None``.
+            workers (int, optional): Number of comment pages fetched at the same time. Defaults to ``4``.
+            replies (bool, optional): If ``False``, the "View more replies" pages are not followed,
+                and only the replies displayed on the post page are retrieved. Defaults to ``True``.
 
         .. note::
             This function can be slow as it also extracts reactions for all comments.
+            Use ``mode="counts"`` if you only need the number of reactions.
+            The comment pages that could not be fetched, even with the driver, are added to ``missing_pages``.
         """
-        self.driver.get(f"{self.BASE_URL}/groups/{group_id}/permalink/{post_id}/?anchor_composer=false")
-        self._unfold_comments()
-        page = self.driver.page_source
-        soup = BeautifulSoup(page, 'lxml')
-
-        # Search for all comments
-        all_comments = []
-        comments = soup.findAll("div", {"data-sigil": "comment"})
-        for comment in comments:
-            comment_user = comment.select("._2b05 a")[0].text
-            comment_user_id = comment.select("._2b05 a")[0].get("href").split("/")[1].split("&")[0].split("?groupid")[0]
-            comment_date = comment.select("abbr")[0].text
-            comment_href = comment.select("._2b05 a")[0].get("href")
-            comment_id = comment.get("data-uniqueid")
-            comment_text = comment.find("div", {"data-sigil": "comment-body"}).text
-            # Search for reactions
-            comments_reactions = []
-            reactions_soup = comment.select("._14v5 a._14v8._4edm")
-            if reactions_soup:
-                comment_href = reactions_soup[0].get("href")
-                comment_group_id, comment_id = comment_href.split("ft_ent_identifier=")[1].split("&")[0].split("_")
-                comments_reactions = self.get_reactions(comment_id)
-
-            # Search for replies
-            replies = []
-            reply_comments = comment.findAll("div", {"data-sigil": "comment inline-reply"})
-            for reply_comment in reply_comments:
-                reply_user = reply_comment.select("._2b05 a")[0].text
-                reply_user_id = reply_comment.select("._2b05 a")[0].get("href").split("/")[1].split("&")[0].split("?groupid")[0]
-                reply_date = reply_comment.select("abbr")[0].text
-                reply_href = reply_comment.select("._2b05 a")[0].get("href")
-                reply_id = reply_comment.get("data-uniqueid")
-                reply_text = reply_comment.find("div", {"data-sigil": "comment-body"}).text
-                # Search for reactions
-                reply_reactions = []
-                reply_reactions_soup = reply_comment.select("._14v5 a._14v8._4edm")
-                if reply_reactions_soup:
-                    reply_href = reply_reactions_soup[0].get("href")
-                    reply_group_id, reply_id = reply_href.split("ft_ent_identifier=")[1].split("&")[0].split("_")
-                    reply_reactions = self.get_reactions(reply_id)
-                # Update the reply comment
-                replies.append({
-                    "href": reply_href,
-                    "comment_id": reply_id,
-                    "text": reply_text,
-                    "user": reply_user,
-                    "user_id": reply_user_id,
-                    "date": convert_date(reply_date).isoformat(),
-                    "reactions": reply_reactions
-                })
-            # Add the comment and all the replies
-            all_comments.append({
-                "href": comment_href,
-                "comment_id": comment_id,
-                "text": comment_text,
-                "user": comment_user,
-                "user_id": comment_user_id,
-                "date": convert_date(comment_date).isoformat(),
-                "reactions": comments_reactions,
-                "replies": replies
-            })
-        return all_comments
+        page = self._load_comments(group_id, post_id)
+        permalink = parse_permalink(page)
+        comments = self._paginate_comments(permalink["comments"], permalink["links"], max_pages=max_pages,
+                                           max_depth=max_depth, max_comments=max_comments, workers=workers, replies=replies)
+        return self._get_comments_reactions(comments, mode=mode)
 
     def _find_posts(self, group_id, sleep=3, scroll_max=None, topk=-1):
-        self.driver.get(f"https://m.facebook.com/groups/{group_id}")
+        self._get(f"https://m.facebook.com/groups/{group_id}")
         self.scroll_end(sleep=sleep, scroll_max=scroll_max)
         page = self.driver.page_source
         soup = BeautifulSoup(page, 'lxml')
@@ -289,7 +439,7 @@ class HallOfFameAPI:
                 if text_soup:
                     text = "\n".join([paragraph_soup.text for paragraph_soup in text_soup])
                 # Search for the ids
-                features = eval(article["data-ft"])
+                features = json.loads(article["data-ft"])
                 post_id = features["top_level_post_id"]
                 group_id = features["group_id"]
                 user = article.select("h3 strong a")[0].text
@@ -301,7 +451,8 @@ class HallOfFameAPI:
                     "user": user,
                     "user_id": user_id,
                     "date": convert_date(date).isoformat(),
-                    "text": text
+                    "text": text,
+                    "reaction_count": parse_reaction_count(article)
                 })
                 raw_articles.append(article)
                 # Break ?
@@ -311,78 +462,369 @@ class HallOfFameAPI:
                 continue
         return posts[:topk], raw_articles[:topk]
 
-    def get_posts(self, group_id, sleep=3, topk=-1, scroll_max=None):
-        all_posts = []
+    def get_posts(self, group_id, sleep=3, topk=-1, scroll_max=None, mode="full", comment_budget=None, plan=None,
+                  processes=0, max_pending=8):
+        """Retrieve the posts of a group, with their comments, replies and reactions.
+
+        Args:
+            group_id (str): ID of the group.
+            sleep (int, optional): Sleep delay between each scroll of the feed. Defaults to ``3``.
+            topk (int, optional): Maximum number of posts to retrieve. If ``-1``, retrieve all posts. Defaults to ``-1``.
+            scroll_max (int, optional): Number of maximum scroll to make. If ``None``, will scroll until the end. Defaults to ``None``.
+            mode (str, optional): If ``"full"``, retrieve the list of users who reacted to each post, comment and reply.
+                If ``"counts"``, only read their number of reactions (``"reaction_count"``) from the post pages,
+                which only needs one page load per post. Defaults to ``"full"``.
+            comment_budget (dict, optional): Budget used to follow the "View previous comments" and "View more replies" pages
+                of each post, with the ``max_pages``, ``max_depth``, ``max_comments`` and ``workers`` keys
+                (see ``get_comments()``). If ``None``, all pages are followed. Defaults to ``None``.
+            plan (dict, optional): Scrape plan, generated with ``plan_scrape()``, used to only retrieve the data needed
+                by some statistics. If provided, the ``mode`` is deduced from the plan. Defaults to ``None``.
+            processes (int, optional): Number of processes used to parse the pages while the driver loads the next ones.
+                If ``0``, pages are parsed in the main process. If ``None``, uses the number of CPUs. Defaults to ``0``.
+            max_pending (int, optional): Maximum number of pages waiting to be parsed, when ``processes`` is used.
+                Defaults to ``8``.
+
+        Returns:
+            list
+        """
+        if mode not in ["full", "counts"]:
+            raise ValueError(f"Unknown mode {mode}. Available options are within {{'full', 'counts'}}.")
         posts, _ = self._find_posts(group_id, sleep=sleep, scroll_max=scroll_max, topk=topk)
+        if plan is not None:
+            mode = "full" if plan["reactions"] else "counts"
+            if not plan["comments"] and not plan["reactions"]:
+                # The group feed already has the number of reactions of each post
+                return [self._build_post(post, [], [], reaction_count=post["reaction_count"]) for post in posts]
+            if not plan["replies"]:
+                comment_budget = {**(comment_budget or {}), "replies": False}
+        if processes != 0:
+            return self._get_posts_pipelined(posts, mode=mode, comment_budget=comment_budget,
+                                             processes=processes, max_pending=max_pending)
+        all_posts = []
         for post in tqdm(posts, desc="Retrieving Data", leave=True, position=0, total=len(posts)):
             try:
-                comments = self.get_comments(group_id, post["post_id"])
-                # Get the reactions for the post
-                reactions = self.get_reactions(post["post_id"])
-                all_posts.append({
-                    "post_id": post["post_id"],
-                    "group_id": group_id,
-                    "user": post["user"],
-                    "user_id": post["user_id"],
-                    "date": post["date"],
-                    "text": post["text"],
-                    "comments": comments,
-                    "reactions": reactions
-                })
+                all_posts.append(self.refresh_post(post, mode=mode, comment_budget=comment_budget))
             except Exception:
                 continue
         return all_posts
 
-    def publish_post(self, group_id, message):
+    def _get_posts_pipelined(self, posts, mode="full", comment_budget=None, processes=None, max_pending=8):
+        """Retrieve the comments and reactions of posts, parsing the pages on a pool of processes
+        while the driver loads the next pages.
+
+        Args:
+            posts (list): Posts retrieved from the group feed.
+            mode (str, optional): Either ``"full"`` or ``"counts"``. See ``get_posts()``. Defaults to ``"full"``.
+            comment_budget (dict, optional): Budget used to follow the comment pages. See ``get_posts()``.
+                Defaults to ``None``.
+            processes (int, optional): Number of processes used to parse the pages. Defaults to ``None``.
+            max_pending (int, optional): Maximum number of pages waiting to be parsed. Defaults to ``8``.
+
+        Returns:
+            list
+        """
+        all_posts = {}
+        for post in posts:
+            all_posts[post["post_id"]] = self._build_post(post, [], [])
+        # Pages to load, as (post_id, loader, args, parser, callback). Pages without parser are already extracted,
+        # and pages without loader are already fetched (``args`` is then the page).
+        loads = deque()
+        remaining = defaultdict(int)
+        failed = set()
+        pbar = tqdm(desc="Retrieving Data", leave=True, position=0, total=len(posts))
+
+        def done(post_id):
+            remaining[post_id] -= 1
+            if remaining[post_id] == 0:
+                pbar.update(1)
+
+        def add_load(post_id, loader, args, parser, callback, first=False):
+            remaining[post_id] += 1
+            if first:
+                loads.appendleft((post_id, loader, args, parser, callback))
+            else:
+                loads.append((post_id, loader, args, parser, callback))
+
+        def guard(post_id, callback):
+            # Skip the post if any of its pages could not be retrieved
+            def guarded_callback(result):
+                try:
+                    callback(result)
+                except Exception:
+                    failed.add(post_id)
+                done(post_id)
+            return guarded_callback
+
+        def fail(post_id):
+            def errback(error):
+                failed.add(post_id)
+                done(post_id)
+            return errback
+
+        def set_reactions(item):
+            def callback(raw_reactions):
+                item["reactions"] = self._resolve_reactions(raw_reactions)
+            return callback
+
+        def add_reactions(post_id, reactions_id, item):
+            if self.extraction == "script":
+                add_load(post_id, self._extract_reactions, (reactions_id,), None, set_reactions(item))
+            else:
+                add_load(post_id, self._load_reactions, (reactions_id,), parse_reactions, set_reactions(item))
+
+        def set_comments(post_id):
+            def callback(permalink):
+                if mode == "counts":
+                    all_posts[post_id]["reaction_count"] = permalink["reaction_count"]
+                budget = {"workers": 4, **(comment_budget or {})}
+                workers = budget.pop("workers")
+                add_comment_pages(post_id, CommentThread(permalink["comments"], permalink["links"], **budget), workers)
+            return callback
+
+        def add_comment_pages(post_id, thread, workers):
+            batch = thread.next_batch()
+            if not batch:
+                set_thread(post_id, thread)
+                return
+            add_load(post_id, self._fetch_pages, ([link["href"] for link, _ in batch], workers), None,
+                     set_comment_pages(post_id, thread, batch, workers))
+
+        def set_comment_pages(post_id, thread, batch, workers):
+            # The pages of a batch are merged in order once they are all parsed, then the next batch is selected
+            results = [None] * len(batch)
+            left = [len(batch)]
+
+            def set_page(index):
+                def callback(result):
+                    results[index] = result
+                    left[0] -= 1
+                    if left[0] == 0:
+                        for (link, depth), parsed in zip(batch, results):
+                            if parsed is not None:
+                                thread.add_page(link, depth, parsed)
+                        add_comment_pages(post_id, thread, workers)
+                return callback
+
+            def callback(pages):
+                for index, ((link, _), page) in reversed(list(enumerate(zip(batch, pages)))):
+                    if page is None:
+                        thread.add_missing(link)
+                        set_page(index)(None)
+                    else:
+                        # Fetched pages are parsed before the other loads, so they are not kept in memory
+                        add_load(post_id, None, page, partial(parse_comment_page, parent_id=link["parent_id"]),
+                                 set_page(index), first=True)
+            return callback
+
+        def set_thread(post_id, thread):
+            all_posts[post_id]["comments"] = thread.comments
+            self.missing_pages.extend(thread.missing)
+            for comment in thread.comments:
+                for item in [comment, *comment["replies"]]:
+                    reactions_id = item.pop("reactions_id")
+                    if mode == "full" and reactions_id is not None:
+                        add_reactions(post_id, reactions_id, item)
+
+        for post_id, post in all_posts.items():
+            add_load(post_id, self._load_comments, (post["group_id"], post_id), parse_permalink, set_comments(post_id))
+            if mode == "full":
+                add_reactions(post_id, post_id, post)
+
+        with ParsePipeline(processes=processes, max_pending=max_pending) as pipeline:
+            while loads or len(pipeline):
+                if not loads:
+                    pipeline.wait()
+                    continue
+                post_id, loader, args, parser, callback = loads.popleft()
+                if post_id in failed:
+                    done(post_id)
+                    continue
+                try:
+                    page = args if loader is None else loader(*args)
+                except Exception:
+                    failed.add(post_id)
+                    done(post_id)
+                    continue
+                if parser is None:
+                    guard(post_id, callback)(page)
+                else:
+                    pipeline.submit(parser, page, guard(post_id, callback), errback=fail(post_id))
+        pbar.close()
+        return [post for post_id, post in all_posts.items() if post_id not in failed]
+
+    def _build_post(self, post, comments, reactions, reaction_count=None):
+        built_post = {
+            "post_id": post["post_id"],
+            "group_id": post["group_id"],
+            "user": post["user"],
+            "user_id": post["user_id"],
+            "date": post["date"],
+            "text": post["text"],
+            "comments": comments,
+            "reactions": reactions
+        }
+        if reaction_count is not None:
+            built_post["reaction_count"] = reaction_count
+        return built_post
+
+    def refresh_post(self, post, mode="full", comment_budget=None):
+        """Retrieve the comments and reactions of a post found in a group feed.
+
+        Args:
+            post (dict): Post retrieved from the group feed, with at least the ``"post_id"``, ``"group_id"``,
+                ``"user"``, ``"user_id"``, ``"date"`` and ``"text"`` keys.
+            mode (str, optional): Either ``"full"`` or ``"counts"``. See ``get_posts()``. Defaults to ``"full"``.
+            comment_budget (dict, optional): Budget used to follow the comment pages. See ``get_posts()``.
+                Defaults to ``None``.
+
+        Returns:
+            dict: the post, with its ``"comments"`` and ``"reactions"``.
+                With ``mode="counts"``, the ``"reactions"`` are empty and the post has a ``"reaction_count"``.
+        """
+        if mode == "counts":
+            # The reaction summaries of the post and its comments are all on the permalink page
+            permalink = parse_permalink(self._load_comments(post["group_id"], post["post_id"]))
+            comments = self._paginate_comments(permalink["comments"], permalink["links"], **(comment_budget or {}))
+            comments = self._get_comments_reactions(comments, mode="counts")
+            return self._build_post(post, comments, [], reaction_count=permalink["reaction_count"])
+        comments = self.get_comments(post["group_id"], post["post_id"], **(comment_budget or {}))
+        # Get the reactions for the post
+        reactions = self.get_reactions(post["post_id"])
+        return self._build_post(post, comments, reactions)
+
+    def list_posts(self, group_id, sleep=3, scroll_max=None, topk=-1):
+        """List the posts of a group feed, without their comments and reactions.
+        The posts can then be retrieved with ``refresh_post()``.
+
+        Args:
+            group_id (str): ID of the group.
+            sleep (int, optional): Sleep delay between each scroll of the feed. Defaults to ``3``.
+            scroll_max (int, optional): Number of maximum scroll to make. If ``None``, will scroll until the end. Defaults to ``None``.
+            topk (int, optional): Maximum number of posts to retrieve. If ``-1``, retrieve all posts. Defaults to ``-1``.
+
+        Returns:
+            list: list of posts (dict), with their ``"reaction_count"`` displayed on the feed.
+        """
+        posts, _ = self._find_posts(group_id, sleep=sleep, scroll_max=scroll_max, topk=topk)
+        return posts
+
+    def _get_first_post_id(self):
+        """Read the ID of the first post of the current feed, without parsing the whole page."""
+        try:
+            article = self.driver.find_element_by_tag_name("article")
+            return json.loads(article.get_attribute("data-ft"))["top_level_post_id"]
+        except Exception:
+            return None
+
+    def publish_post(self, group_id, message, timeout=30, retries=3):
         """Publish a post to a facebook group/page.
 
         Args:
-            driver (selenium.webdriver.firefox.webdriver.WebDriver): WebDriver connected to the post page.
-                The current supported driver is only limited to Firefox.
+            group_id (str): ID of the group where the post is published.
             message (str): Message to post.
+            timeout (int, optional): Maximum delay (in seconds) to wait for the composer and the published post.
+                Defaults to ``30``.
+            retries (int, optional): Number of retries if the composer could not be used. Defaults to ``3``.
+
+        Returns:
+            str: the ID of the published post, or ``None`` if it could not be found.
+
+        .. note::
+            The ID is read from the redirection after publishing. If facebook stays on the group feed,
+            the ID is read from the first post of the feed, once it changed.
         """
-        self.driver.get(f"https://m.facebook.com/groups/{group_id}")
+        self._get(f"{self.BASE_URL}/groups/{group_id}")
+        last_post_id = self._get_first_post_id()
         self.driver.find_elements_by_class_name("_4g34._6ber._78cq._7cdk._5i2i._52we")[0].click()
         page = self.driver.page_source
         soup = BeautifulSoup(page, 'lxml')
         text_soup = soup.select("textarea")[-2]
-        textarea = WebDriverWait(self.driver, 30).until(EC.element_to_be_clickable((By.XPATH, xpath_soup(text_soup))))
-        textarea.send_keys(message)
         post_soup = soup.findAll("div", {"data-sigil": "upper_submit_composer"})[-1].select("button")[0]
         try:
-            post_button = WebDriverWait(self.driver, 30).until(EC.element_to_be_clickable((By.XPATH, xpath_soup(post_soup))))
+            textarea = WebDriverWait(self.driver, timeout).until(EC.element_to_be_clickable((By.XPATH, xpath_soup(text_soup))))
+            textarea.send_keys(message)
+            post_button = WebDriverWait(self.driver, timeout).until(EC.element_to_be_clickable((By.XPATH, xpath_soup(post_soup))))
         except Exception as error:
+            if retries <= 0:
+                raise
             print(f"Could not publish. Retrying... {error}")
-            return self.publish_post(group_id, message)
+            return self.publish_post(group_id, message, timeout=timeout, retries=retries - 1)
+        composer_url = self.driver.current_url
         post_button.click()
-        # Wait for the message to be posted
-        time.sleep(5)
-        # Return the id of the last post (likely to be the published one)
-        posts, _ = self._find_posts(group_id, sleep=0, scroll_max=1)
-        return posts[0]["post_id"]
 
-    def edit_post(self, group_id, post_id, message):
+        # Wait for the composer to redirect to the new post, or for the new post to appear on top of the feed
+        def find_published_id(driver):
+            if driver.current_url != composer_url:
+                post_id = get_post_id(driver.current_url)
+                if post_id is not None:
+                    return post_id
+            post_id = self._get_first_post_id()
+            if post_id is not None and post_id != last_post_id:
+                return post_id
+            return False
+
+        try:
+            return str(WebDriverWait(self.driver, timeout).until(find_published_id))
+        except Exception:
+            return None
+
+    def publish_posts(self, group_id, messages, timeout=30, retries=3):
+        """Publish multiple posts to a facebook group/page, in the same session.
+
+        Args:
+            group_id (str): ID of the group where the posts are published.
+            messages (list): Messages to post.
+            timeout (int, optional): Maximum delay (in seconds) to wait for each post. Defaults to ``30``.
+            retries (int, optional): Number of retries per post. Defaults to ``3``.
+
+        Returns:
+            list: the IDs of the published posts, in the same order as the ``messages``.
+                A failed post has a ``None`` ID.
+        """
+        post_ids = []
+        for message in tqdm(messages, desc="Publishing", leave=True, position=0, total=len(messages)):
+            try:
+                post_ids.append(self.publish_post(group_id, message, timeout=timeout, retries=retries))
+            except Exception as error:
+                print(f"Could not publish. Skipping... {error}")
+                post_ids.append(None)
+        return post_ids
+
+    def edit_post(self, group_id, post_id, message, timeout=30, retries=3):
         """Edit a post to a facebook group/page.
 
         Args:
-            driver (selenium.webdriver.firefox.webdriver.WebDriver): WebDriver connected to the post page.
-                The current supported driver is only limited to Firefox.
+            group_id (str): ID of the group of the post.
             post_id: (str): ID of the post to edit. (e.g. `"745393222993590"`)
             message (str): New message.
+            timeout (int, optional): Maximum delay (in seconds) to wait for the edit menu and dialog.
+                Defaults to ``30``.
+            retries (int, optional): Number of retries if the post could not be saved. Defaults to ``3``.
 
         .. note::
             This function will erase the previous post's text, and rewrite it with the new message.
+            The post is accessed through its permalink, so it does not need to be on top of the group feed.
         """
-        posts, raw_articles = self._find_posts(group_id, sleep=0, scroll_max=1)
-        for post, raw_article in zip(posts, raw_articles):
-            if str(post_id) == post["post_id"]:
+        self._get(f"{self.BASE_URL}/groups/{group_id}/permalink/{post_id}/?anchor_composer=false")
+        # Find the option menu of the post
+        soup = self._get_soup()
+        options = None
+        for article in soup.find_all("article"):
+            try:
+                if str(json.loads(article["data-ft"])["top_level_post_id"]) != str(post_id):
+                    continue
+            except Exception:
+                continue
+            options_soup = article.select("._4s19")
+            if options_soup:
+                options = options_soup[0]
                 break
-        # Click the option menu to edit the post
-        options = raw_article.select("._4s19")[0]
+        if options is None:
+            raise ValueError(f"Could not find the post {post_id} in the group {group_id}.")
         self.driver.find_element_by_xpath(xpath_soup(options)).click()
-        time.sleep(2)
-        page = self.driver.page_source
-        soup = BeautifulSoup(page, 'lxml')
+        # Click the edit button, once the menu is opened
+        WebDriverWait(self.driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, '[data-sigil*="editPostButton"]')))
+        soup = self._get_soup()
         option_buttons = soup.select("._56bz._54k8._55i1._58a0.touchable._53n6")
         edit_buttons = []
         for option in option_buttons:
@@ -390,24 +832,44 @@ class HallOfFameAPI:
                 edit_buttons.append(option)
         edit_button = edit_buttons[-1]
         self.driver.find_element_by_xpath(xpath_soup(edit_button)).click()
-        # Edit
-        page = self.driver.page_source
-        soup = BeautifulSoup(page, 'lxml')
+        # Edit and save, from the same dialog
+        WebDriverWait(self.driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, "#modalDialogHeaderButtons button")))
+        soup = self._get_soup()
         text_soup = soup.select("textarea")[-2]
-        textarea = WebDriverWait(self.driver, 30).until(EC.element_to_be_clickable((By.XPATH, xpath_soup(text_soup))))  # id can change ! ex id="uniqid_1"
+        save_soup = soup.select("#modalDialogHeaderButtons button")[0]
+        textarea = WebDriverWait(self.driver, timeout).until(EC.element_to_be_clickable((By.XPATH, xpath_soup(text_soup))))  # id can change ! ex id="uniqid_1"
         textarea.clear()
         textarea.send_keys(message)
-        # Save
-        page = self.driver.page_source
-        soup = BeautifulSoup(page, 'lxml')
-        save_soup = soup.select("#modalDialogHeaderButtons button")[0]
         try:
-            save_button = WebDriverWait(self.driver, 30).until(EC.element_to_be_clickable((By.XPATH, xpath_soup(save_soup))))
+            save_button = WebDriverWait(self.driver, timeout).until(EC.element_to_be_clickable((By.XPATH, xpath_soup(save_soup))))
         except Exception as error:
+            if retries <= 0:
+                raise
             print(f"Could not edit. Retrying... {error}")
-            return self.edit_post(group_id, post_id, message)
+            return self.edit_post(group_id, post_id, message, timeout=timeout, retries=retries - 1)
         save_button.click()
 
+    def edit_posts(self, group_id, messages, timeout=30, retries=3):
+        """Edit multiple posts to a facebook group/page, in the same session.
+
+        Args:
+            group_id (str): ID of the group of the posts.
+            messages (dict): New messages, indexed by the ID of the post to edit.
+            timeout (int, optional): Maximum delay (in seconds) to wait for each edit. Defaults to ``30``.
+            retries (int, optional): Number of retries per post. Defaults to ``3``.
+
+        Returns:
+            list: the IDs of the posts that could not be edited.
+        """
+        failed = []
+        for post_id, message in tqdm(messages.items(), desc="Editing", leave=True, position=0, total=len(messages)):
+            try:
+                self.edit_post(group_id, post_id, message, timeout=timeout, retries=retries)
+            except Exception as error:
+                print(f"Could not edit {post_id}. Skipping... {error}")
+                failed.append(post_id)
+        return failed
+
     def quit(self):
         self.driver.quit()
 
@@ -0,0 +1,116 @@
+class CommentThread:
+    r"""
+    Comments of a post, merged across the post page and its "View previous comments" and "View more replies" pages.
+
+    The links are followed breadth-first: :meth:`next_batch` returns the links to fetch within the budget,
+    and the parsed pages are merged with :meth:`add_page`. Comments and replies are identified by their ``"unique_id"``,
+    so the ones displayed on several pages are only kept once.
+
+    * :attr:`comments` (list): The merged comments. Each comment has a list of ``"replies"``.
+
+    * :attr:`max_pages` (int): Maximum number of pages to fetch. If ``None``, no limit.
+
+    * :attr:`max_depth` (int): Maximum number of successive links to follow from the post page. If ``None``, no limit.
+
+    * :attr:`max_comments` (int): Stop once this number of comments and replies is collected. If ``None``, no limit.
+
+    * :attr:`replies` (bool): If ``False``, the "View more replies" pages are not followed.
+
+    * :attr:`num_pages` (int): Number of pages selected so far.
+
+    * :attr:`missing` (list): Links to the pages that could not be fetched. If not empty, the thread is incomplete.
+
+    Example:
+        >>> thread = CommentThread(permalink["comments"], permalink["links"], max_pages=10)
+        >>> batch = thread.next_batch()
+        >>> while batch:
+        ...     for link, depth in batch:
+        ...         thread.add_page(link, depth, parse_comment_page(fetch(link["href"]), parent_id=link["parent_id"]))
+        ...     batch = thread.next_batch()
+    """
+
+    def __init__(self, comments, links, max_pages=None, max_depth=None, max_comments=None, replies=True):
+        self.comments = comments
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.max_comments = max_comments
+        self.replies = replies
+        self.num_pages = 0
+        self.missing = []
+        self._comments_by_id = {}
+        self._reply_ids = {}
+        for comment in list(comments):
+            if comment["unique_id"] in self._comments_by_id:
+                comments.remove(comment)
+                continue
+            self._comments_by_id[comment["unique_id"]] = comment
+            self._reply_ids[comment["unique_id"]] = {reply["unique_id"] for reply in comment["replies"]}
+        self.num_comments = sum(1 + len(comment["replies"]) for comment in comments)
+        self._visited = set()
+        self._frontier = [(link, 1) for link in links]
+
+    def _add_comment(self, comment):
+        if comment["unique_id"] in self._comments_by_id:
+            # Keep the replies loaded on another page
+            for reply in comment["replies"]:
+                self._add_reply(comment["unique_id"], reply)
+            return 0
+        replies = comment["replies"]
+        comment["replies"] = []
+        self._comments_by_id[comment["unique_id"]] = comment
+        self._reply_ids[comment["unique_id"]] = set()
+        self.comments.append(comment)
+        return 1 + sum(self._add_reply(comment["unique_id"], reply) for reply in replies)
+
+    def _add_reply(self, parent_id, reply):
+        if parent_id not in self._comments_by_id or reply["unique_id"] in self._reply_ids[parent_id]:
+            return 0
+        self._reply_ids[parent_id].add(reply["unique_id"])
+        self._comments_by_id[parent_id]["replies"].append(reply)
+        return 1
+
+    def next_batch(self):
+        """Select the next links to follow within the budget.
+        The pages of a batch should all be merged before asking for the next one.
+
+        Returns:
+            list: the links to fetch, as ``(link, depth)`` tuples. Empty if the thread is exhausted or the budget is reached.
+        """
+        batch = []
+        for link, depth in self._frontier:
+            if link["href"] in self._visited or (self.max_depth is not None and depth > self.max_depth):
+                continue
+            if not self.replies and link["parent_id"] is not None:
+                continue
+            if self.max_pages is not None and self.num_pages + len(batch) >= self.max_pages:
+                break
+            self._visited.add(link["href"])
+            batch.append((link, depth))
+        self._frontier = []
+        if self.max_comments is not None and self.num_comments >= self.max_comments:
+            return []
+        self.num_pages += len(batch)
+        return batch
+
+    def add_page(self, link, depth, result):
+        """Merge a parsed page of comments or replies.
+
+        Args:
+            link (dict): The link of the page, from ``next_batch()``.
+            depth (int): The depth of the link, from ``next_batch()``.
+            result (dict): The page, parsed with ``parse_comment_page()``.
+        """
+        for comment in result["comments"]:
+            if link["parent_id"] is None:
+                self.num_comments += self._add_comment(comment)
+            else:
+                self.num_comments += self._add_reply(link["parent_id"], comment)
+        self._frontier.extend((next_link, depth + 1) for next_link in result["links"])
+
+    def add_missing(self, link):
+        """Record a page that could not be fetched.
+
+        Args:
+            link (dict): The link of the page, from ``next_batch()``.
+        """
+        self.missing.append(link["href"])
@@ -0,0 +1,261 @@
+import numpy as np
+from scipy import sparse
+
+
+REACTIONS = ["LIKE", "LOVE", "CARE", "AHAH", "WOW", "SAD", "ANGER"]
+
+
+def iter_interactions(posts):
+    """Iterate over the reactions of posts, comments and replies.
+
+    Args:
+        posts (list): List of posts, retrieved from the API.
+
+    Yields:
+        tuple: the user who reacted, the author of the post (or comment, reply) and the reaction type.
+    """
+    for post in posts:
+        for reaction in post["reactions"]:
+            yield reaction["user"], post["user"], reaction["reaction"].upper()
+        for comment in post["comments"]:
+            for reaction in comment["reactions"]:
+                yield reaction["user"], comment["user"], reaction["reaction"].upper()
+            for reply in comment["replies"]:
+                for reaction in reply["reactions"]:
+                    yield reaction["user"], reply["user"], reaction["reaction"].upper()
+
+
+class InteractionGraph:
+    r"""
+    Sparse graph of who reacts to whom. Each reaction type is stored in a sparse ``users x users`` matrix,
+    where the rows are the users who reacted and the columns are the authors of the posts, comments and replies.
+
+    * :attr:`users` (list): Names of the users. The index of a user is its row (and column) in the matrices.
+
+    * :attr:`user2index` (dict): Dictionary mapping the users to their index.
+
+    * :attr:`matrices` (dict): Dictionary mapping the reaction types to their ``scipy.sparse.csr_matrix``.
+
+    * :attr:`self_reactions` (bool): Whether users reacting to their own posts are kept.
+
+    Example:
+        >>> graph = InteractionGraph.from_posts(posts)
+        >>> graph.top_pairs(k=3)
+            [{'user': 'Léa Ricot → Jean Neymar', 'reactor': 'Léa Ricot', 'author': 'Jean Neymar', 'count': 42}, ...]
+    """
+
+    def __init__(self, users, matrices, self_reactions=False):
+        self.users = list(users)
+        self.user2index = {user: index for index, user in enumerate(self.users)}
+        self.matrices = matrices
+        self.self_reactions = self_reactions
+        self._total = None
+
+    @classmethod
+    def from_edges(cls, reactors, authors, reactions, users, self_reactions=False):
+        """Create a graph from arrays of interactions.
+
+        Args:
+            reactors (numpy.ndarray): Indices of the users who reacted.
+            authors (numpy.ndarray): Indices of the authors who received the reactions.
+            reactions (numpy.ndarray): Index of the reaction type, within ``REACTIONS``.
+            users (list): Names of the users.
+            self_reactions (bool, optional): Whether users reacting to their own posts are kept. Defaults to ``False``.
+
+        Returns:
+            InteractionGraph
+        """
+        reactors = np.asarray(reactors, dtype=np.int64)
+        authors = np.asarray(authors, dtype=np.int64)
+        reactions = np.asarray(reactions, dtype=np.int64)
+        if not self_reactions:
+            mask = reactors != authors
+            reactors, authors, reactions = reactors[mask], authors[mask], reactions[mask]
+        shape = (len(users), len(users))
+        matrices = {}
+        for index, reaction in enumerate(REACTIONS):
+            mask = reactions == index
+            data = np.ones(int(mask.sum()), dtype=np.int64)
+            # Duplicated (reactor, author) entries are summed when converted to CSR
+            matrices[reaction] = sparse.coo_matrix((data, (reactors[mask], authors[mask])), shape=shape).tocsr()
+        return cls(users, matrices, self_reactions=self_reactions)
+
+    @classmethod
+    def from_posts(cls, posts, self_reactions=False):
+        """Create a graph from the reactions of posts, comments and replies.
+
+        Args:
+            posts (list): List of posts, retrieved from the API.
+            self_reactions (bool, optional): Whether users reacting to their own posts are kept. Defaults to ``False``.
+
+        Returns:
+            InteractionGraph
+        """
+        user2index = {}
+        reaction2index = {reaction: index for index, reaction in enumerate(REACTIONS)}
+        reactors, authors, reactions = [], [], []
+        for reactor, author, reaction in iter_interactions(posts):
+            if reaction not in reaction2index:
+                continue
+            reactors.append(user2index.setdefault(reactor, len(user2index)))
+            authors.append(user2index.setdefault(author, len(user2index)))
+            reactions.append(reaction2index[reaction])
+        return cls.from_edges(reactors, authors, reactions, list(user2index.keys()), self_reactions=self_reactions)
+
+    def matrix(self, reaction=None):
+        """Get the ``users x users`` matrix of reactions.
+
+        Args:
+            reaction (str, optional): Reaction type (e.g. ``"AHAH"``). If ``None``, all reactions are summed.
+                Defaults to ``None``.
+
+        Returns:
+            scipy.sparse.csr_matrix
+        """
+        if reaction is not None:
+            return self.matrices[reaction.upper()]
+        if self._total is None:
+            self._total = sum(self.matrices.values())
+        return self._total
+
+    def _top_entries(self, matrix, k):
+        matrix = sparse.coo_matrix(matrix)
+        if matrix.nnz == 0:
+            return []
+        k = min(k, matrix.nnz)
+        top = np.argpartition(-matrix.data, k - 1)[:k]
+        top = top[np.argsort(-matrix.data[top], kind="stable")]
+        return [(int(matrix.row[i]), int(matrix.col[i]), int(matrix.data[i])) for i in top]
+
+    def top_pairs(self, k=10, reaction=None):
+        """Get the pairs of users with the most reactions from one to the other.
+
+        Args:
+            k (int, optional): Number of pairs. Defaults to ``10``.
+            reaction (str, optional): Reaction type. If ``None``, all reactions are counted. Defaults to ``None``.
+
+        Returns:
+            list
+        """
+        return [{
+            "user": f"{self.users[reactor]} → {self.users[author]}",
+            "reactor": self.users[reactor],
+            "author": self.users[author],
+            "count": count
+        } for reactor, author, count in self._top_entries(self.matrix(reaction), k)]
+
+    def mutual_pairs(self, k=10, reaction=None):
+        """Get the pairs of users who react the most to each other.
+        The count of a pair is the minimum of the reactions in both directions.
+
+        Args:
+            k (int, optional): Number of pairs. Defaults to ``10``.
+            reaction (str, optional): Reaction type. If ``None``, all reactions are counted. Defaults to ``None``.
+
+        Returns:
+            list
+        """
+        matrix = self.matrix(reaction)
+        mutual = sparse.triu(matrix.minimum(matrix.T), k=1)
+        return [{
+            "user": f"{self.users[user1]} & {self.users[user2]}",
+            "users": [self.users[user1], self.users[user2]],
+            "count": count
+        } for user1, user2, count in self._top_entries(mutual, k)]
+
+    def biggest_fans(self, k=10, reaction=None):
+        """Get the biggest fan of each author, i.e. the user who reacted the most to its posts, comments and replies.
+        The authors are ranked by the number of reactions of their biggest fan.
+
+        Args:
+            k (int, optional): Number of authors. Defaults to ``10``.
+            reaction (str, optional): Reaction type. If ``None``, all reactions are counted. Defaults to ``None``.
+
+        Returns:
+            list
+        """
+        matrix = self.matrix(reaction).tocsc()
+        if matrix.shape[0] == 0 or matrix.nnz == 0:
+            return []
+        counts = np.asarray(matrix.max(axis=0).todense()).ravel()
+        fans = np.asarray(matrix.argmax(axis=0)).ravel()
+        authors = np.flatnonzero(counts > 0)
+        authors = authors[np.argsort(-counts[authors], kind="stable")][:k]
+        return [{
+            "user": f"{self.users[fans[author]]} → {self.users[author]}",
+            "reactor": self.users[fans[author]],
+            "author": self.users[author],
+            "count": int(counts[author])
+        } for author in authors]
+
+    def reciprocity(self, reaction=None):
+        """Get the global reciprocity, i.e. the fraction of reactions given back by the author.
+
+        Args:
+            reaction (str, optional): Reaction type. If ``None``, all reactions are counted. Defaults to ``None``.
+
+        Returns:
+            float
+        """
+        matrix = self.matrix(reaction)
+        total = matrix.sum()
+        if total == 0:
+            return 0.0
+        return float(matrix.minimum(matrix.T).sum() / total)
+
+    def user_reciprocity(self, k=10, reaction=None, min_reactions=10):
+        """Get the users whose reactions are the most given back.
+
+        Args:
+            k (int, optional): Number of users. Defaults to ``10``.
+            reaction (str, optional): Reaction type. If ``None``, all reactions are counted. Defaults to ``None``.
+            min_reactions (int, optional): Minimum number of reactions given by a user to be ranked. Defaults to ``10``.
+
+        Returns:
+            list
+        """
+        matrix = self.matrix(reaction)
+        given = np.asarray(matrix.sum(axis=1)).ravel()
+        reciprocated = np.asarray(matrix.minimum(matrix.T).sum(axis=1)).ravel()
+        users = np.flatnonzero((given >= max(min_reactions, 1)))
+        ratios = reciprocated[users] / given[users]
+        order = np.argsort(-ratios, kind="stable")[:k]
+        return [{
+            "user": self.users[users[i]],
+            "count": round(float(ratios[i]), 3)
+        } for i in order]
+
+
+def get_graph_stats(posts, k=10, min_reactions=10):
+    """Get the sorted interaction statistics, in the same format as ``get_top_stats()``.
+    * :attr:`TOP-PAIR` : The pairs of users with the most reactions from one to the other.
+    * :attr:`MUTUAL-PAIR` : The pairs of users who react the most to each other.
+    * :attr:`BIGGEST-FAN` : The users who reacted the most to a single author.
+    * :attr:`BIGGEST-FAN-AHAH` : The users who reacted the most with "AHAH" to a single author (same for the other reactions).
+    * :attr:`RECIPROCITY` : The users whose reactions are the most given back.
+
+    Args:
+        posts (list or InteractionGraph): List of posts, retrieved from the API, or an already built graph.
+        k (int, optional): Number of entries per statistic. Defaults to ``10``.
+        min_reactions (int, optional): Minimum number of reactions given by a user to be ranked in ``RECIPROCITY``.
+            Defaults to ``10``.
+
+    Returns:
+        dict
+
+    Example:
+        >>> top_stats = get_top_stats(posts)
+        >>> top_stats.update(get_graph_stats(posts))
+        >>> apply_stats_template("The biggest fan is: <<TOP1-BIGGEST-FAN>>", top_stats)
+            'The biggest fan is: Léa Ricot → Jean Neymar'
+    """
+    graph = posts if isinstance(posts, InteractionGraph) else InteractionGraph.from_posts(posts)
+    graph_stats = {
+        "TOP-PAIR": graph.top_pairs(k=k),
+        "MUTUAL-PAIR": graph.mutual_pairs(k=k),
+        "BIGGEST-FAN": graph.biggest_fans(k=k),
+        "RECIPROCITY": graph.user_reciprocity(k=k, min_reactions=min_reactions),
+    }
+    for reaction in REACTIONS:
+        graph_stats[f"BIGGEST-FAN-{reaction}"] = graph.biggest_fans(k=k, reaction=reaction)
+    return graph_stats
@@ -0,0 +1,195 @@
+import re
+from bs4 import BeautifulSoup
+
+from .utils import convert_date, parse_count, parse_reaction_summary
+
+
+def get_user_id(href):
+    """Retrieve the ID of a user from the ``href`` of its profile.
+
+    Args:
+        href (str): Link to the user profile, relative to ``https://m.facebook.com``.
+
+    Returns:
+        str
+    """
+    return href.split("/")[1].split("&")[0].split("?groupid")[0]
+
+
+def parse_reactions(page):
+    """Parse a reaction browser page.
+
+    Args:
+        page (str): HTML source of the reaction browser page.
+
+    Returns:
+        list: list of reactions (dict) containing the user, its id and the classes of the reaction emoji.
+            The classes are converted to a reaction by the API.
+
+    .. note::
+        This function does not use the driver, so it can be run in another process.
+    """
+    soup = BeautifulSoup(page, 'lxml')
+    reactions = []
+    for reaction in soup.select(".item"):
+        # Get the name of the person who reacted
+        user = reaction.select("span strong")[0].text
+        user_id = get_user_id(reaction.select("a")[0].get("href"))
+        # Find the reaction emoji
+        react_classes = reaction.parent.select("i.img._59aq")[0].get("class")
+        reactions.append({
+            "user": user,
+            "user_id": user_id,
+            "classes": react_classes
+        })
+    return reactions
+
+
+def _parse_comment(comment):
+    user = comment.select("._2b05 a")[0].text
+    user_id = get_user_id(comment.select("._2b05 a")[0].get("href"))
+    date = comment.select("abbr")[0].text
+    href = comment.select("._2b05 a")[0].get("href")
+    comment_id = comment.get("data-uniqueid")
+    text = comment.find("div", {"data-sigil": "comment-body"}).text
+    # Search for reactions
+    reactions_id = None
+    reaction_count = 0
+    reactions_soup = comment.select("._14v5 a._14v8._4edm")
+    if reactions_soup:
+        href = reactions_soup[0].get("href")
+        _, comment_id = href.split("ft_ent_identifier=")[1].split("&")[0].split("_")
+        reactions_id = comment_id
+        reaction_count = parse_count(reactions_soup[0].text)
+    return {
+        "href": href,
+        "comment_id": comment_id,
+        "text": text,
+        "user": user,
+        "user_id": user_id,
+        "date": convert_date(date).isoformat(),
+        "unique_id": comment.get("data-uniqueid"),
+        "reactions_id": reactions_id,
+        "reaction_count": reaction_count,
+        "reactions": []
+    }
+
+
+def _parse_comments(soup):
+    all_comments = []
+    for comment in soup.findAll("div", {"data-sigil": "comment"}):
+        parsed_comment = _parse_comment(comment)
+        # Search for replies
+        parsed_comment["replies"] = [_parse_comment(reply_comment)
+                                     for reply_comment in comment.findAll("div", {"data-sigil": "comment inline-reply"})]
+        all_comments.append(parsed_comment)
+    return all_comments
+
+
+def parse_comments(page):
+    """Parse a post permalink page, and retrieve its comments and replies.
+
+    Args:
+        page (str): HTML source of the permalink page.
+
+    Returns:
+        list: list of comments (dict). Each comment has a list of ``"replies"``.
+            The ``"unique_id"`` of a comment/reply identifies it across pages.
+            The ``"reactions_id"`` of a comment/reply is the ID used to retrieve its reactions,
+            or ``None`` if nobody reacted. The ``"reaction_count"`` is the number of reactions displayed on the page.
+
+    .. note::
+        This function does not use the driver, so it can be run in another process.
+    """
+    soup = BeautifulSoup(page, 'lxml')
+    return _parse_comments(soup)
+
+
+def parse_reaction_count(soup):
+    """Retrieve the number of reactions displayed in the reaction summary of a post.
+
+    Args:
+        soup (bs4.Element): The post (article) or the permalink page.
+
+    Returns:
+        int
+    """
+    summary = soup.find("div", {"data-sigil": "reactions-sentence-container"})
+    if summary is None:
+        return 0
+    count_soup = summary.select("._1g06")
+    if count_soup:
+        return parse_count(count_soup[0].text)
+    return parse_reaction_summary(summary.text)
+
+
+def _parse_comment_links(soup, parent_id=None):
+    links = []
+    # "View previous comments" and "View more comments" (or replies, on a replies page)
+    for link in soup.select('div[id^="see_prev_"] a[href], div[id^="see_next_"] a[href]'):
+        links.append({"href": link.get("href"), "parent_id": parent_id})
+    # "View N more replies"
+    for link in soup.select('a[href*="/comment/replies/"]'):
+        parent = link.find_parent("div", {"data-sigil": "comment"})
+        links.append({"href": link.get("href"), "parent_id": parent.get("data-uniqueid") if parent else parent_id})
+    return links
+
+
+def is_comment_page(page):
+    """Check that a page displays comments or replies, or links to other pages of comments.
+    Used to detect the login and checkpoint pages returned when the session is rejected.
+
+    Args:
+        page (str): HTML source of the page.
+
+    Returns:
+        bool
+    """
+    return re.search(r"""data-sigil=["']comment|id=["']see_(?:prev|next)_""", page or "") is not None
+
+
+def parse_permalink(page):
+    """Parse a post permalink page, and retrieve the reaction summary of the post and its comments.
+
+    Args:
+        page (str): HTML source of the permalink page.
+
+    Returns:
+        dict: the ``"reaction_count"`` of the post, its ``"comments"`` (see ``parse_comments()``),
+            and the ``"links"`` to the next pages of comments and replies (see ``parse_comment_page()``).
+
+    .. note::
+        This function does not use the driver, so it can be run in another process.
+    """
+    soup = BeautifulSoup(page, 'lxml')
+    return {
+        "reaction_count": parse_reaction_count(soup),
+        "comments": _parse_comments(soup),
+        "links": _parse_comment_links(soup)
+    }
+
+
+def parse_comment_page(page, parent_id=None):
+    """Parse a page of comments, or a page of replies.
+
+    Args:
+        page (str): HTML source of the page.
+        parent_id (str, optional): Unique ID of the comment whose replies are on the page.
+            If ``None``, the page contains top level comments. Defaults to ``None``.
+
+    Returns:
+        dict: the ``"comments"`` (or replies) of the page, and the ``"links"`` to the next pages.
+            A link is a dict with its ``"href"``, and the ``"parent_id"`` of the comment whose replies it loads
+            (``None`` for top level comments).
+    """
+    soup = BeautifulSoup(page, 'lxml')
+    if parent_id is None:
+        comments = _parse_comments(soup)
+    else:
+        # The replies page may also display the replied comment
+        comments = [_parse_comment(comment) for comment in soup.find_all("div", {"data-sigil": re.compile(r"^comment( |$)")})
+                    if comment.get("data-uniqueid") != parent_id]
+    return {
+        "comments": comments,
+        "links": _parse_comment_links(soup, parent_id=parent_id)
+    }
@@ -0,0 +1,87 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+
+class ParsePipeline:
+    r"""
+    Parse HTML pages on a pool of processes, while the driver loads the next pages.
+
+    Pages are submitted with a parser (a function taking the HTML source) and a callback.
+    Callbacks are always called from the main thread (the one using the driver),
+    so they can use the driver or submit new pages.
+
+    * :attr:`processes` (int): Number of processes used to parse the pages. If ``None``, uses the number of CPUs.
+
+    * :attr:`max_pending` (int): Maximum number of pages waiting to be parsed. When reached,
+        :meth:`submit` blocks until a page is parsed, so the driver does not run too far ahead of the parsers.
+
+    Example:
+        >>> with ParsePipeline(processes=4) as pipeline:
+        ...     for post_id in post_ids:
+        ...         page = api._load_reactions(post_id)
+        ...         pipeline.submit(parse_reactions, page, callback=print)
+    """
+
+    def __init__(self, processes=None, max_pending=8):
+        self.processes = processes
+        self.max_pending = max_pending
+        self.executor = None
+        self.pending = deque()
+
+    def __enter__(self):
+        self.executor = ProcessPoolExecutor(max_workers=self.processes)
+        return self
+
+    def __exit__(self, *args):
+        try:
+            self.join()
+        finally:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __len__(self):
+        return len(self.pending)
+
+    def submit(self, parser, page, callback, errback=None):
+        """Parse a page in another process.
+
+        Args:
+            parser (callable): Function used to parse the page. It must be defined at the module level.
+            page (str): HTML source of the page.
+            callback (callable): Function called with the parsed result.
+            errback (callable, optional): Function called with the error if the page could not be parsed.
+                If ``None``, the error is raised. Defaults to ``None``.
+        """
+        while len(self.pending) >= self.max_pending:
+            self.wait()
+        future = self.executor.submit(parser, page)
+        self.pending.append((future, callback, errback))
+        self.poll()
+
+    def _process(self, future, callback, errback):
+        error = future.exception()
+        if error is None:
+            callback(future.result())
+        elif errback is not None:
+            errback(error)
+        else:
+            raise error
+
+    def poll(self):
+        """Call the callbacks of the pages already parsed, without blocking."""
+        done = [task for task in self.pending if task[0].done()]
+        for task in done:
+            self.pending.remove(task)
+            self._process(*task)
+
+    def wait(self):
+        """Block until at least one page is parsed, and call its callback."""
+        if not self.pending:
+            return
+        wait([future for future, _, _ in self.pending], return_when=FIRST_COMPLETED)
+        self.poll()
+
+    def join(self):
+        """Block until all pages are parsed."""
+        while self.pending:
+            self.wait()
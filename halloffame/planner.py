@@ -0,0 +1,85 @@
+import re
+
+
+# Data needed by each statistic, in addition to the group feed.
+# * "comments": the post pages, with their comments and their number of reactions.
+# * "replies": the "View more replies" pages.
+# * "reactions": the list of users who reacted to each post, comment and reply.
+STAT_REQUIREMENTS = {
+    "POST-COUNT": set(),
+    "POST-REACTION-COUNT": set(),
+    "BEST-POST-REACTION": set(),
+    "COMMENT-COUNT": {"comments"},
+    "COMMENT-REACTION-COUNT": {"comments"},
+    "BEST-COMMENT-REACTION": {"comments"},
+    "REPLY-COUNT": {"comments", "replies"},
+    "REPLY-REACTION-COUNT": {"comments", "replies"},
+    "BEST-REPLY-REACTION": {"comments", "replies"},
+    "COMMENT-REPLY-COUNT": {"comments", "replies"},
+    "REACTION-COUNT": {"comments", "replies", "reactions"},
+    "REACTION-AHAH": {"comments", "replies", "reactions"},
+    "REACTION-LOVE": {"comments", "replies", "reactions"},
+    "REACTION-CARE": {"comments", "replies", "reactions"},
+    "REACTION-WOW": {"comments", "replies", "reactions"},
+    "REACTION-SAD": {"comments", "replies", "reactions"},
+    "REACTION-ANGER": {"comments", "replies", "reactions"},
+    "REACTION-LIKE": {"comments", "replies", "reactions"},
+    # Interaction statistics, see ``get_graph_stats()``
+    "TOP-PAIR": {"comments", "replies", "reactions"},
+    "MUTUAL-PAIR": {"comments", "replies", "reactions"},
+    "BIGGEST-FAN": {"comments", "replies", "reactions"},
+    "RECIPROCITY": {"comments", "replies", "reactions"},
+}
+
+
+def get_template_keys(template):
+    """Get the statistics used in a template.
+
+    Args:
+        template (str): The template containing ``<<TOPn-KEY>>`` keywords.
+
+    Returns:
+        list: the statistics keys, in order of appearance.
+
+    Example:
+        >>> get_template_keys("Best post: <<TOP1-BEST-POST-REACTION>>, most active: <<TOP1-POST-COUNT>>")
+            ['BEST-POST-REACTION', 'POST-COUNT']
+    """
+    keys = []
+    for key in re.findall(r"<<TOP\d+-([A-Z0-9-]+)>>", template):
+        if key not in keys:
+            keys.append(key)
+    return keys
+
+
+def plan_scrape(template):
+    """Get the minimum scrape plan needed to compute the statistics of a template.
+    The plan can be provided to ``HallOfFameAPI.get_posts()``.
+
+    * :attr:`comments` : Whether the post pages (comments and their number of reactions) are needed.
+    * :attr:`replies` : Whether the "View more replies" pages are needed.
+    * :attr:`reactions` : Whether the list of users who reacted to each post, comment and reply is needed.
+
+    The group feed is always scrapped, and gives the number of reactions of each post.
+
+    Args:
+        template (str or list): The template, or a list of statistics keys (e.g. the keys of ``get_top_stats()``).
+            Unknown keys are assumed to need everything.
+
+    Returns:
+        dict
+
+    Example:
+        >>> plan_scrape("Best post: <<TOP1-BEST-POST-REACTION>>, most active: <<TOP1-POST-COUNT>>")
+            {'comments': False, 'replies': False, 'reactions': False}
+        >>> posts = api.get_posts("your_group_id", plan=plan_scrape(template))
+    """
+    keys = get_template_keys(template) if isinstance(template, str) else list(template)
+    needs = set()
+    for key in keys:
+        needs |= STAT_REQUIREMENTS.get(key.upper(), {"comments", "replies", "reactions"})
+    return {
+        "comments": "comments" in needs,
+        "replies": "replies" in needs,
+        "reactions": "reactions" in needs
+    }
@@ -0,0 +1,256 @@
+import os
+import json
+import time
+import heapq
+from collections import deque
+from datetime import datetime
+
+from .stats import count_reactions
+
+
+def count_activity(post):
+    """Count the number of interactions (reactions, comments, replies and their reactions) of a post.
+
+    Args:
+        post (dict): Post retrieved from the API.
+
+    Returns:
+        int
+    """
+    activity = count_reactions(post)
+    for comment in post.get("comments", []):
+        activity += 1 + count_reactions(comment)
+        for reply in comment.get("replies", []):
+            activity += 1 + count_reactions(reply)
+    return activity
+
+
+class RefreshScheduler:
+    r"""
+    Long-running scheduler used to keep the posts of multiple groups up to date,
+    while keeping the number of page loads bounded.
+
+    Each post is refreshed with :meth:`HallOfFameAPI.refresh_post`, and its next refresh is scheduled depending on
+    its age and its recent activity: recent and active posts are refreshed often, old and quiet posts rarely.
+    The group feeds are also scrapped regularly to discover new posts.
+
+    * :attr:`api` (HallOfFameAPI): API connected to facebook.
+
+    * :attr:`group_ids` (list): IDs of the groups to track.
+
+    * :attr:`state_path` (str): Path to the JSON file where the posts and refresh metadata are saved.
+
+    * :attr:`page_budget` (int): Maximum number of page loads within a ``period``.
+
+    * :attr:`period` (int): Duration (in seconds) of the sliding window used for the ``page_budget``.
+
+    * :attr:`min_interval` (int): Minimum delay (in seconds) between two refreshes of the same post.
+
+    * :attr:`max_interval` (int): Maximum delay (in seconds) between two refreshes of the same post.
+
+    * :attr:`feed_interval` (int): Delay (in seconds) between two scrapes of a group feed.
+
+    * :attr:`hot_hours` (int): Age (in hours) under which a post is considered recent.
+
+    * :attr:`mode` (str): Either ``"full"`` or ``"counts"``. See :meth:`HallOfFameAPI.get_posts`.
+
+    * :attr:`comment_budget` (dict): Budget used to follow the comment pages of a post. See :meth:`HallOfFameAPI.get_posts`.
+
+    * :attr:`save_interval` (int): Minimum delay (in seconds) between two saves of the state.
+        The state is always saved when :meth:`run` exits.
+
+    .. note::
+        The budget is checked before each task. As the number of pages needed to refresh a post is only known afterward,
+        a task can slightly exceed the remaining budget. The next tasks will then wait until the window frees up.
+
+    Example:
+        >>> scheduler = RefreshScheduler(api, ["group_id_1", "group_id_2"], page_budget=120)
+        >>> scheduler.run(duration=24 * 3600)
+        >>> posts = scheduler.get_posts("group_id_1")
+        >>> stats = get_top_stats(posts)
+    """
+
+    def __init__(self, api, group_ids, state_path="halloffame_state.json", page_budget=60, period=3600,
+                 min_interval=900, max_interval=7 * 24 * 3600, feed_interval=1800, hot_hours=48, mode="full",
+                 comment_budget=None, save_interval=300):
+        self.api = api
+        self.group_ids = [str(group_id) for group_id in group_ids]
+        self.state_path = state_path
+        self.page_budget = page_budget
+        self.period = period
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.feed_interval = feed_interval
+        self.hot_hours = hot_hours
+        self.mode = mode
+        self.comment_budget = comment_budget
+        self.save_interval = save_interval
+        self.state = {group_id: {"posts": {}, "meta": {}} for group_id in self.group_ids}
+        # Timestamps of the page loads within the current period, globally and per group
+        self._loads = deque()
+        self._group_loads = {group_id: deque() for group_id in self.group_ids}
+        # One priority queue of (due, counter, post_id) tasks per group. A ``None`` post_id is a feed task.
+        self._queues = {group_id: [] for group_id in self.group_ids}
+        self._counter = 0
+        self._last_save = time.time()
+        self.load()
+
+    def load(self):
+        """Load the saved state, and schedule the refresh of all known posts."""
+        if os.path.exists(self.state_path):
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                saved_state = json.load(f)
+            for group_id in self.group_ids:
+                if group_id in saved_state:
+                    self.state[group_id] = saved_state[group_id]
+        now = time.time()
+        for group_id in self.group_ids:
+            self._push(group_id, None, now)
+            for post_id, meta in self.state[group_id]["meta"].items():
+                self._push(group_id, post_id, meta.get("next_refresh", now))
+
+    def save(self):
+        """Save the state of all groups to ``state_path``."""
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+        self._last_save = time.time()
+
+    def get_posts(self, group_id):
+        """Get the posts of a group, as known by the scheduler.
+
+        Args:
+            group_id (str): ID of the group.
+
+        Returns:
+            list: list of posts, that can be used with ``get_top_stats()``.
+        """
+        return list(self.state[str(group_id)]["posts"].values())
+
+    def _push(self, group_id, post_id, due):
+        self._counter += 1
+        heapq.heappush(self._queues[group_id], (due, self._counter, post_id))
+
+    def _interval(self, post, activity):
+        """Delay before the next refresh of a post, depending on its age and its recent activity."""
+        try:
+            age_hours = (datetime.now() - datetime.fromisoformat(post["date"])).total_seconds() / 3600
+        except (KeyError, ValueError):
+            age_hours = 0
+        age_hours = max(age_hours, 0)
+        # Linear growth while the post is recent, then quadratic, continuing from twice the minimal interval
+        if age_hours < self.hot_hours:
+            interval = self.min_interval * (1 + age_hours / self.hot_hours)
+        else:
+            interval = 2 * self.min_interval * (age_hours / self.hot_hours) ** 2
+        # Active posts are refreshed sooner
+        interval /= 1 + activity
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def _release(self, now):
+        """Remove the page loads older than the current period."""
+        for loads in [self._loads, *self._group_loads.values()]:
+            while loads and loads[0] <= now - self.period:
+                loads.popleft()
+
+    def _record(self, group_id, page_loads, now):
+        for _ in range(page_loads):
+            self._loads.append(now)
+            self._group_loads[group_id].append(now)
+
+    def _next_task(self, now):
+        """Select the next due task, from the group that used the least pages within the current period."""
+        due_groups = [group_id for group_id in self.group_ids
+                      if self._queues[group_id] and self._queues[group_id][0][0] <= now]
+        if not due_groups:
+            return None
+        group_id = min(due_groups, key=lambda group_id: (len(self._group_loads[group_id]), self._queues[group_id][0][0]))
+        _, _, post_id = heapq.heappop(self._queues[group_id])
+        return group_id, post_id
+
+    def _refresh_feed(self, group_id, now):
+        # The feed task is always scheduled again, even if the feed could not be scrapped
+        self._push(group_id, None, now + self.feed_interval)
+        try:
+            posts = self.api.list_posts(group_id, sleep=3, scroll_max=1)
+        except Exception as error:
+            print(f"Could not refresh the feed of group {group_id}. Retrying later... {error}")
+            return
+        group_state = self.state[group_id]
+        for post in posts:
+            post_id = post["post_id"]
+            if post_id not in group_state["meta"]:
+                group_state["posts"][post_id] = {**post, "comments": [], "reactions": []}
+                group_state["meta"][post_id] = {"last_refresh": None, "next_refresh": now, "activity": 0}
+                self._push(group_id, post_id, now)
+
+    def _refresh_post(self, group_id, post_id, now):
+        group_state = self.state[group_id]
+        old_post = group_state["posts"][post_id]
+        meta = group_state["meta"][post_id]
+        try:
+            post = self.api.refresh_post(old_post, mode=self.mode, comment_budget=self.comment_budget)
+        except Exception as error:
+            print(f"Could not refresh post {post_id}. Retrying later... {error}")
+            post = old_post
+        # Exponentially decayed number of new interactions since the last refresh
+        new_activity = max(count_activity(post) - count_activity(old_post), 0) if meta["last_refresh"] else 0
+        meta["activity"] = 0.5 * meta["activity"] + new_activity
+        meta["last_refresh"] = now
+        meta["next_refresh"] = now + self._interval(post, meta["activity"])
+        group_state["posts"][post_id] = post
+        self._push(group_id, post_id, meta["next_refresh"])
+
+    def step(self):
+        """Run the next due task, if the page budget allows it.
+
+        Returns:
+            bool: ``True`` if a task was run, ``False`` otherwise.
+        """
+        now = time.time()
+        self._release(now)
+        if len(self._loads) >= self.page_budget:
+            return False
+        task = self._next_task(now)
+        if task is None:
+            return False
+        group_id, post_id = task
+        page_loads = self.api.page_loads
+        if post_id is None:
+            self._refresh_feed(group_id, now)
+        else:
+            self._refresh_post(group_id, post_id, now)
+        self._record(group_id, self.api.page_loads - page_loads, now)
+        if time.time() - self._last_save >= self.save_interval:
+            self.save()
+        return True
+
+    def _wait_time(self, now):
+        """Time to wait (in seconds) before the next task can run."""
+        if len(self._loads) >= self.page_budget:
+            return max(self._loads[0] + self.period - now, 0)
+        dues = [queue[0][0] for queue in self._queues.values() if queue]
+        return max(min(dues) - now, 0) if dues else self.feed_interval
+
+    def run(self, duration=None):
+        """Run the scheduler.
+
+        Args:
+            duration (int, optional): Duration (in seconds) of the run. If ``None``, will run forever. Defaults to ``None``.
+        """
+        start = time.time()
+        try:
+            while duration is None or time.time() - start < duration:
+                if not self.step():
+                    now = time.time()
+                    self._release(now)
+                    wait = self._wait_time(now)
+                    if duration is not None:
+                        wait = min(wait, max(start + duration - now, 0))
+                    time.sleep(max(wait, 1))
+        finally:
+            self.save()
+
+    def __repr__(self):
+        return f"<RefreshScheduler groups={len(self.group_ids)} budget={self.page_budget}/{self.period}s>"
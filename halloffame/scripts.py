@@ -0,0 +1,27 @@
+# JavaScript extractors, run in the browser with ``driver.execute_script``.
+# They return compact JSON rows instead of the whole ``page_source``.
+
+
+EXTRACT_REACTIONS = """
+// Extract the reactions added to the reaction browser since the last call.
+// Extracted items are marked, so the next call only returns the new ones.
+// The items that could not be extracted are returned as errors, so they are reported instead of skipped.
+var rows = [];
+var errors = [];
+var items = document.querySelectorAll(".item:not([data-hof-seen])");
+for (var i = 0; i < items.length; i++) {
+    var item = items[i];
+    item.setAttribute("data-hof-seen", "1");
+    try {
+        var user = item.querySelector("span strong").textContent;
+        var href = item.querySelector("a").getAttribute("href");
+        var userId = href.split("/")[1].split("&")[0].split("?groupid")[0];
+        var emoji = item.parentNode.querySelector("i.img._59aq");
+        var classes = emoji.className.split(/\\s+/).filter(function (name) { return name.indexOf("sx_") === 0; });
+        rows.push([user, userId, classes]);
+    } catch (error) {
+        errors.push(String(error));
+    }
+}
+return {"rows": rows, "errors": errors};
+"""
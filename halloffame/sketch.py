@@ -0,0 +1,447 @@
+import math
+import heapq
+import hashlib
+from functools import lru_cache
+import numpy as np
+
+from .stats import STATS_KEYS, iter_user_stats
+
+
+@lru_cache(maxsize=2 ** 16)
+def hash64(item, seed=0):
+    """Hash an item to a 64 bits integer. The hash is the same across processes, so sketches can be merged.
+    The last hashes are cached, as the same users are hashed by several sketches.
+
+    Args:
+        item (str): Item to hash.
+        seed (int, optional): Seed of the hash function. Defaults to ``0``.
+
+    Returns:
+        int
+    """
+    digest = hashlib.blake2b(str(item).encode("utf-8"), digest_size=8, salt=seed.to_bytes(16, "little")).digest()
+    return int.from_bytes(digest, "little")
+
+
+class CountMinSketch:
+    r"""
+    Count-Min sketch, used to estimate the count of any item in fixed memory.
+    The estimate never underestimates the count, and overestimates it by at most ``epsilon * total``
+    with probability ``1 - delta``.
+
+    * :attr:`width` (int): Number of counters per row. ``epsilon = e / width``.
+
+    * :attr:`depth` (int): Number of rows (hash functions). ``delta = exp(-depth)``.
+
+    * :attr:`total` (int): Sum of all the counts.
+    """
+
+    def __init__(self, width=2048, depth=5):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+
+    @property
+    def epsilon(self):
+        return math.e / self.width
+
+    @property
+    def delta(self):
+        return math.exp(-self.depth)
+
+    def _indices(self, item):
+        # Double hashing: the depth hash functions are derived from two halves of a single hash
+        value = hash64(item)
+        hash1, hash2 = value & 0xFFFFFFFF, (value >> 32) | 1
+        return [(hash1 + row * hash2) % self.width for row in range(self.depth)]
+
+    def update(self, item, count=1):
+        # A plain loop is faster than fancy indexing for a few rows
+        table = self.table
+        for row, index in enumerate(self._indices(item)):
+            table[row, index] += count
+        self.total += count
+
+    def update_many(self, items, counts):
+        """Update the sketch with several items at once.
+
+        Args:
+            items (list): The items.
+            counts (list): The count of each item.
+        """
+        values = np.array([hash64(item) for item in items], dtype=np.uint64)
+        hash1, hash2 = values & np.uint64(0xFFFFFFFF), (values >> np.uint64(32)) | np.uint64(1)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        indices = (hash1 + rows * hash2) % np.uint64(self.width)
+        counts = np.asarray(counts, dtype=np.int64)
+        np.add.at(self.table, (rows.astype(np.int64), indices.astype(np.int64)), counts)
+        self.total += int(counts.sum())
+
+    def estimate(self, item):
+        return int(self.table[np.arange(self.depth), self._indices(item)].min())
+
+    def error(self):
+        """Maximum overestimation of a count, with probability ``1 - delta``."""
+        return self.epsilon * self.total
+
+    def merge(self, other):
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Cannot merge Count-Min sketches with different dimensions.")
+        self.table += other.table
+        self.total += other.total
+        return self
+
+
+class SpaceSaving:
+    r"""
+    Space-Saving summary, used to find the heavy hitters (items with the highest counts) in fixed memory.
+    At most ``capacity`` items are monitored. The count of a monitored item overestimates its real count
+    by at most its ``error``, and any item whose count is higher than ``total / capacity`` is monitored.
+
+    * :attr:`capacity` (int): Maximum number of monitored items.
+
+    * :attr:`counters` (dict): Dictionary mapping the monitored items to their ``[count, error]``.
+
+    * :attr:`total` (int): Sum of all the counts.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counters = {}
+        self.total = 0
+        # Heap of (count, item), with outdated entries removed lazily
+        self._heap = []
+
+    def _min(self):
+        while True:
+            count, item = self._heap[0]
+            if item in self.counters and self.counters[item][0] == count:
+                return count, item
+            heapq.heappop(self._heap)
+            if item in self.counters:
+                heapq.heappush(self._heap, (self.counters[item][0], item))
+
+    def update(self, item, count=1):
+        self.total += count
+        if item in self.counters:
+            self.counters[item][0] += count
+        elif len(self.counters) < self.capacity:
+            self.counters[item] = [count, 0]
+            heapq.heappush(self._heap, (count, item))
+        else:
+            # Replace the item with the lowest count
+            min_count, min_item = self._min()
+            heapq.heappop(self._heap)
+            del self.counters[min_item]
+            self.counters[item] = [min_count + count, min_count]
+            heapq.heappush(self._heap, (min_count + count, item))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild()
+
+    def _rebuild(self):
+        self._heap = [(count, item) for item, (count, _) in self.counters.items()]
+        heapq.heapify(self._heap)
+
+    def min_count(self):
+        """Highest possible count of an item that is not monitored."""
+        if len(self.counters) < self.capacity:
+            return 0
+        return self._min()[0]
+
+    def top(self, k=None):
+        """Get the monitored items with the highest counts.
+
+        Returns:
+            list: list of ``(item, count, error)``, where the real count is within ``[count - error, count]``.
+        """
+        items = sorted(self.counters.items(), key=lambda counter: counter[1][0], reverse=True)[:k]
+        return [(item, count, error) for item, (count, error) in items]
+
+    def merge(self, other):
+        if self.capacity != other.capacity:
+            raise ValueError("Cannot merge Space-Saving summaries with different capacities.")
+        self_min, other_min = self.min_count(), other.min_count()
+        counters = {}
+        for item in set(self.counters) | set(other.counters):
+            count1, error1 = self.counters.get(item, [self_min, self_min])
+            count2, error2 = other.counters.get(item, [other_min, other_min])
+            counters[item] = [count1 + count2, error1 + error2]
+        items = sorted(counters.items(), key=lambda counter: counter[1][0], reverse=True)[:self.capacity]
+        self.counters = {item: counter for item, counter in items}
+        self.total += other.total
+        self._rebuild()
+        return self
+
+
+class TopMax:
+    r"""
+    Keep the items with the highest maximum value in fixed memory (used for the ``BEST-*`` statistics).
+    On a single stream, the top items are exact.
+
+    * :attr:`capacity` (int): Maximum number of kept items.
+
+    * :attr:`values` (dict): Dictionary mapping the kept items to their maximum value.
+
+    * :attr:`threshold` (int): Highest value of a removed item. After a merge, the maximum of a kept item
+        may be underestimated by at most ``threshold - value``.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.values = {}
+        self.threshold = 0
+        self._heap = []
+
+    def _min(self):
+        while True:
+            value, item = self._heap[0]
+            if self.values.get(item) == value:
+                return value, item
+            heapq.heappop(self._heap)
+
+    def update(self, item, value):
+        if item in self.values:
+            if value > self.values[item]:
+                self.values[item] = value
+                heapq.heappush(self._heap, (value, item))
+        elif len(self.values) < self.capacity:
+            self.values[item] = value
+            heapq.heappush(self._heap, (value, item))
+        else:
+            min_value, min_item = self._min()
+            if value <= min_value:
+                self.threshold = max(self.threshold, value)
+                return
+            heapq.heappop(self._heap)
+            del self.values[min_item]
+            self.threshold = max(self.threshold, min_value)
+            self.values[item] = value
+            heapq.heappush(self._heap, (value, item))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild()
+
+    def _rebuild(self):
+        self._heap = [(value, item) for item, value in self.values.items()]
+        heapq.heapify(self._heap)
+
+    def top(self, k=None):
+        """Get the items with the highest maximum value.
+
+        Returns:
+            list: list of ``(item, value, error)``, where the real maximum is within ``[value, value + error]``.
+        """
+        items = sorted(self.values.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(item, value, max(self.threshold - value, 0)) for item, value in items]
+
+    def merge(self, other):
+        if self.capacity != other.capacity:
+            raise ValueError("Cannot merge summaries with different capacities.")
+        values = dict(self.values)
+        for item, value in other.values.items():
+            values[item] = max(values.get(item, value), value)
+        items = sorted(values.items(), key=lambda item: item[1], reverse=True)
+        self.values = dict(items[:self.capacity])
+        removed = [value for _, value in items[self.capacity:]]
+        self.threshold = max([self.threshold, other.threshold, *removed])
+        self._rebuild()
+        return self
+
+
+class HyperLogLog:
+    r"""
+    HyperLogLog sketch, used to count the number of distinct items in fixed memory.
+    The relative standard error is ``1.04 / sqrt(2 ** precision)``.
+
+    * :attr:`precision` (int): Number of bits used to select a register. Uses ``2 ** precision`` registers.
+    """
+
+    def __init__(self, precision=14):
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+
+    def add(self, item):
+        value = hash64(item)
+        index = value >> (64 - self.precision)
+        remaining = value & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self):
+        num_registers = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / num_registers)
+        estimate = alpha * num_registers ** 2 / np.sum(2.0 ** -self.registers.astype(np.float64))
+        # Small range correction
+        num_zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * num_registers and num_zeros > 0:
+            estimate = num_registers * math.log(num_registers / num_zeros)
+        return int(round(estimate))
+
+    def error(self):
+        """Relative standard error of the count."""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def merge(self, other):
+        if self.precision != other.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precisions.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+
+class ApproximateStats:
+    r"""
+    Approximate per user statistics, in fixed memory. Each cumulative statistic (e.g. ``POST-COUNT``) keeps a
+    Space-Saving summary of its heavy hitters and a Count-Min sketch, while each ``BEST-*`` statistic keeps the
+    users with the highest maxima. Distinct users and reactors are counted with HyperLogLog sketches.
+
+    The statistics can be updated with new posts, and merged across shards (e.g. one per year of posts),
+    as long as they are created with the same parameters.
+
+    * :attr:`capacity` (int): Number of users monitored per statistic. The top-k answers are reliable for ``k << capacity``.
+
+    * :attr:`width` (int): Width of the Count-Min sketches.
+
+    * :attr:`depth` (int): Depth of the Count-Min sketches.
+
+    * :attr:`precision` (int): Precision of the HyperLogLog sketches.
+
+    * :attr:`batch_size` (int): Number of ``(user, statistic)`` pairs aggregated before updating the sketches.
+        Larger batches hash each user less often, but use more memory.
+
+    Example:
+        >>> stats = ApproximateStats(posts_2019).merge(ApproximateStats(posts_2020))
+        >>> top_stats = get_top_stats(stats)
+        >>> apply_stats_template("The best post is: <<TOP1-BEST-POST-REACTION>>", top_stats)
+            'The best post is: Léa Ricot'
+    """
+
+    def __init__(self, posts=None, capacity=1000, width=2048, depth=5, precision=14, batch_size=10000):
+        self.capacity = capacity
+        self.width = width
+        self.depth = depth
+        self.precision = precision
+        self.batch_size = batch_size
+        self.heavy_hitters = {}
+        self.sketches = {}
+        self.maxima = {}
+        for key in STATS_KEYS:
+            if key.startswith("BEST-"):
+                self.maxima[key] = TopMax(capacity)
+            else:
+                self.heavy_hitters[key] = SpaceSaving(capacity)
+                self.sketches[key] = CountMinSketch(width, depth)
+        self.users = HyperLogLog(precision)
+        self.reactors = HyperLogLog(precision)
+        if posts is not None:
+            self.update(posts)
+
+    def update(self, posts):
+        """Update the statistics with new posts.
+
+        Args:
+            posts (list): List of posts, retrieved from the API.
+
+        Returns:
+            ApproximateStats
+        """
+        # The events are aggregated per user and statistic before updating the sketches,
+        # so a user is hashed once per batch instead of once per event
+        batch = {}
+        for user, key, value in iter_user_stats(posts):
+            if key in self.maxima:
+                if batch.get((key, user), -1) < value:
+                    batch[key, user] = value
+            elif key in self.heavy_hitters:
+                batch[key, user] = batch.get((key, user), 0) + value
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = {}
+        self._flush(batch)
+        return self
+
+    def _flush(self, batch):
+        users, reactors = set(), set()
+        counts = {key: ([], []) for key in self.sketches}
+        for (key, user), value in batch.items():
+            users.add(user)
+            if key in self.maxima:
+                self.maxima[key].update(user, value)
+            else:
+                self.heavy_hitters[key].update(user, value)
+                counts[key][0].append(user)
+                counts[key][1].append(value)
+                if key.startswith("REACTION-"):
+                    reactors.add(user)
+        for key, (key_users, values) in counts.items():
+            if key_users:
+                self.sketches[key].update_many(key_users, values)
+        for user in users:
+            self.users.add(user)
+        for user in reactors:
+            self.reactors.add(user)
+
+    def merge(self, other):
+        """Merge the statistics of another shard.
+
+        Args:
+            other (ApproximateStats): Statistics created with the same parameters.
+
+        Returns:
+            ApproximateStats
+        """
+        for key in self.maxima:
+            self.maxima[key].merge(other.maxima[key])
+        for key in self.heavy_hitters:
+            self.heavy_hitters[key].merge(other.heavy_hitters[key])
+            self.sketches[key].merge(other.sketches[key])
+        self.users.merge(other.users)
+        self.reactors.merge(other.reactors)
+        return self
+
+    def estimate(self, user, key):
+        """Estimate the statistic of a user, even if it is not in the top users.
+
+        Args:
+            user (str): Name of the user.
+            key (str): Statistic key (e.g. ``"POST-COUNT"``).
+
+        Returns:
+            int
+        """
+        if key in self.maxima:
+            return self.maxima[key].values.get(user, 0)
+        return self.sketches[key].estimate(user)
+
+    def distinct_users(self):
+        """Estimate the number of distinct users (authors and reactors)."""
+        return self.users.count()
+
+    def distinct_reactors(self):
+        """Estimate the number of distinct users who reacted."""
+        return self.reactors.count()
+
+    def get_top_stats(self, k=None):
+        """Get the sorted top statistics, in the same format as ``get_top_stats()``.
+        Each entry also has an ``"error"``: the real count is within ``[count - error, count]``
+        for cumulative statistics, and within ``[count, count + error]`` for ``BEST-*`` statistics.
+
+        Args:
+            k (int, optional): Number of users per statistic. If ``None``, all monitored users. Defaults to ``None``.
+
+        Returns:
+            dict
+        """
+        top_stats = {}
+        for key in STATS_KEYS:
+            if key in self.maxima:
+                top = self.maxima[key].top(k)
+            else:
+                top = []
+                for user, count, error in self.heavy_hitters[key].top():
+                    # Both summaries overestimate the count, so the lowest one is the tightest
+                    estimate = min(count, self.sketches[key].estimate(user))
+                    top.append((user, estimate, estimate - (count - error)))
+                top = sorted(top, key=lambda entry: entry[1], reverse=True)[:k]
+            top_stats[key] = [{"user": user, "count": count, "error": error} for user, count, error in top]
+        return top_stats
@@ -11,83 +11,145 @@ import json
 from collections import defaultdict
 
 
-def get_user_stats(posts):
-    """Get per user statistics.
-    * :attr:`POST-COUNT` : The cumulative sum of posts.
-    * :attr:`POST-REACTION-COUNT` : The cumulative sum of post reactions.
-    * :attr:`BEST-POST-REACTION` : The posts with the highest reactions.
-    * :attr:`COMMENT-COUNT` : The cumulative sum of comments.
-    * :attr:`COMMENT-REACTION-COUNT` : The cumulative sum of comments reactions.
-    * :attr:`BEST-COMMENT-REACTION` : The comments with the highest reactions.
-    * :attr:`REPLY-COUNT` : The cumulative sum of replies.
-    * :attr:`REPLY-REACTION-COUNT` : The cumulative sum of replies reactions.
-    * :attr:`BEST-REPLY-REACTION` : The replies with the highest reactions.
-    * :attr:`COMMENT-REPLY-COUNT` : The cumulative sum of replies and comments.
-    * :attr:`REACTION-COUNT` : The cumulative sum of reactions.
-    * :attr:`REACTION-AHAH` : The cumulative sum of "AHAH" reactions.
-    * :attr:`REACTION-LOVE` : The cumulative sum of "LOVE" reactions.
-    * :attr:`REACTION-CARE` : The cumulative sum of "CARE" reactions.
-    * :attr:`REACTION-WOW` : The cumulative sum of "WOW" reactions.
-    * :attr:`REACTION-SAD` : The cumulative sum of "SAD" reactions.
-    * :attr:`REACTION-ANGER` : The cumulative sum of "ANGER" reactions.
-    * :attr:`REACTION-LIKE` : The cumulative sum of "LIKE" reactions.
+STATS_KEYS = [
+    "POST-COUNT",
+    "POST-REACTION-COUNT",
+    "BEST-POST-REACTION",
+    "COMMENT-COUNT",
+    "COMMENT-REACTION-COUNT",
+    "BEST-COMMENT-REACTION",
+    "REPLY-COUNT",
+    "REPLY-REACTION-COUNT",
+    "BEST-REPLY-REACTION",
+    "COMMENT-REPLY-COUNT",
+    "REACTION-COUNT",
+    "REACTION-AHAH",
+    "REACTION-LOVE",
+    "REACTION-CARE",
+    "REACTION-WOW",
+    "REACTION-SAD",
+    "REACTION-ANGER",
+    "REACTION-LIKE",
+]
+
+
+def count_reactions(item):
+    """Get the number of reactions of a post, comment or reply.
 
     Args:
-        posts (list): List of posts, retrieved from the API.
+        item (dict): Post, comment or reply, retrieved from the API.
+            If its list of ``"reactions"`` was not retrieved (e.g. with ``get_posts(mode="counts")``),
+            its ``"reaction_count"`` summary is used.
 
     Returns:
-        dict
+        int
+    """
+    if item.get("reactions"):
+        return len(item["reactions"])
+    return item.get("reaction_count", 0)
+
+
+def iter_user_stats(posts):
+    """Iterate over the statistics updates of posts, in the order they are found.
+    The ``BEST-*`` statistics are maxima, while the other statistics are cumulative sums.
+
+    Args:
+        posts (list): List of posts, retrieved from the API.
+
+    Yields:
+        tuple: the user, the statistic key and the value.
     """
-    stats = defaultdict(lambda: defaultdict(int))
     for post in posts:
         post_author = post["user"]
-        stats[post_author]["POST-COUNT"] += 1
+        yield post_author, "POST-COUNT", 1
+        # People who reacted to the post
+        if count_reactions(post) > 0:
+            yield post_author, "POST-REACTION-COUNT", count_reactions(post)
         for post_reaction in post["reactions"]:
-            # People who reacted to the post
-            stats[post_author]["POST-REACTION-COUNT"] += 1
             # People who reacted
             reaction_author = post_reaction["user"]
             reaction_type = post_reaction["reaction"]
-            stats[reaction_author]["REACTION-COUNT"] += 1
-            stats[reaction_author][f"REACTION-{reaction_type.upper()}"] += 1
+            yield reaction_author, "REACTION-COUNT", 1
+            yield reaction_author, f"REACTION-{reaction_type.upper()}", 1
 
         # Update best stats
-        stats[post_author]["BEST-POST-REACTION"] = max(stats[post_author]["BEST-POST-REACTION"], len(post["reactions"]))
+        yield post_author, "BEST-POST-REACTION", count_reactions(post)
 
         # look for comments
         for comment in post["comments"]:
             comment_author = comment["user"]
-            stats[comment_author]["COMMENT-COUNT"] += 1
-            stats[comment_author]["COMMENT-REPLY-COUNT"] += 1
+            yield comment_author, "COMMENT-COUNT", 1
+            yield comment_author, "COMMENT-REPLY-COUNT", 1
+            # People who reacted to his comment
+            if count_reactions(comment) > 0:
+                yield comment_author, "COMMENT-REACTION-COUNT", count_reactions(comment)
 
             for comment_reaction in comment["reactions"]:
-                # People who reacted to his comment
-                stats[comment_author]["COMMENT-REACTION-COUNT"] += 1
                 # People who reacted
                 reaction_author = comment_reaction["user"]
                 reaction_type = comment_reaction["reaction"]
-                stats[reaction_author]["REACTION-COUNT"] += 1
-                stats[reaction_author][f"REACTION-{reaction_type.upper()}"] += 1
+                yield reaction_author, "REACTION-COUNT", 1
+                yield reaction_author, f"REACTION-{reaction_type.upper()}", 1
 
             # Look for replies
             for reply in comment["replies"]:
                 reply_author = comment["user"]
-                stats[reply_author]["REPLY-COUNT"] += 1
-                stats[reply_author]["COMMENT-REPLY-COUNT"] += 1
+                yield reply_author, "REPLY-COUNT", 1
+                yield reply_author, "COMMENT-REPLY-COUNT", 1
+                # People who reacted to his reply
+                if count_reactions(reply) > 0:
+                    yield reply_author, "REPLY-REACTION-COUNT", count_reactions(reply)
 
                 for reply_reaction in reply["reactions"]:
-                    # People who reacted to his comment
-                    stats[reply_author]["REPLY-REACTION-COUNT"] += 1
                     # People who reacted
                     reaction_author = reply_reaction["user"]
                     reaction_type = reply_reaction["reaction"]
-                    stats[reaction_author]["REACTION-COUNT"] += 1
-                    stats[reaction_author][f"REACTION-{reaction_type.upper()}"] += 1
+                    yield reaction_author, "REACTION-COUNT", 1
+                    yield reaction_author, f"REACTION-{reaction_type.upper()}", 1
 
                 # Update best stats
-                stats[reply_author]["BEST-REPLY-REACTION"] = max(stats[reply_author]["BEST-REPLY-REACTION"], len(reply["reactions"]))
-            stats[comment_author]["BEST-COMMENT-REACTION"] = max(stats[comment_author]["BEST-COMMENT-REACTION"], len(comment["reactions"]))
+                yield reply_author, "BEST-REPLY-REACTION", count_reactions(reply)
+            yield comment_author, "BEST-COMMENT-REACTION", count_reactions(comment)
+
 
+def get_user_stats(posts):
+    """Get per user statistics.
+    * :attr:`POST-COUNT` : The cumulative sum of posts.
+    * :attr:`POST-REACTION-COUNT` : The cumulative sum of post reactions.
+    * :attr:`BEST-POST-REACTION` : The posts with the highest reactions.
+    * :attr:`COMMENT-COUNT` : The cumulative sum of comments.
+    * :attr:`COMMENT-REACTION-COUNT` : The cumulative sum of comments reactions.
+    * :attr:`BEST-COMMENT-REACTION` : The comments with the highest reactions.
+    * :attr:`REPLY-COUNT` : The cumulative sum of replies.
+    * :attr:`REPLY-REACTION-COUNT` : The cumulative sum of replies reactions.
+    * :attr:`BEST-REPLY-REACTION` : The replies with the highest reactions.
+    * :attr:`COMMENT-REPLY-COUNT` : The cumulative sum of replies and comments.
+    * :attr:`REACTION-COUNT` : The cumulative sum of reactions.
+    * :attr:`REACTION-AHAH` : The cumulative sum of "AHAH" reactions.
+    * :attr:`REACTION-LOVE` : The cumulative sum of "LOVE" reactions.
+    * :attr:`REACTION-CARE` : The cumulative sum of "CARE" reactions.
+    * :attr:`REACTION-WOW` : The cumulative sum of "WOW" reactions.
+    * :attr:`REACTION-SAD` : The cumulative sum of "SAD" reactions.
+    * :attr:`REACTION-ANGER` : The cumulative sum of "ANGER" reactions.
+    * :attr:`REACTION-LIKE` : The cumulative sum of "LIKE" reactions.
+
+    Args:
+        posts (list): List of posts, retrieved from the API.
+
+    Returns:
+        dict
+
+    .. note::
+        Posts retrieved with ``get_posts(mode="counts")`` only have reaction summaries.
+        The ``*-REACTION-COUNT`` and ``BEST-*-REACTION`` statistics are computed from these summaries,
+        while the ``REACTION-*`` statistics (who reacted) stay empty.
+    """
+    stats = defaultdict(lambda: defaultdict(int))
+    for user, key, value in iter_user_stats(posts):
+        if key.startswith("BEST-"):
+            stats[user][key] = max(stats[user][key], value)
+        else:
+            stats[user][key] += value
     return json.loads(json.dumps(stats))
 
 
@@ -113,32 +175,17 @@ def get_top_stats(posts):
     * :attr:`REACTION-LIKE` : The cumulative sum of "LIKE" reactions.
 
     Args:
-        posts (list): List of posts, retrieved from the API.
+        posts (list or ApproximateStats): List of posts, retrieved from the API,
+            or approximate statistics (see ``ApproximateStats``).
 
     Returns:
         dict
     """
+    if hasattr(posts, "get_top_stats"):
+        # Approximate statistics, already aggregated
+        return posts.get_top_stats()
     stats = get_user_stats(posts)
-    top_stats = {
-        "POST-COUNT": [],
-        "POST-REACTION-COUNT": [],
-        "BEST-POST-REACTION": [],
-        "COMMENT-COUNT": [],
-        "COMMENT-REACTION-COUNT": [],
-        "BEST-COMMENT-REACTION": [],
-        "REPLY-COUNT": [],
-        "REPLY-REACTION-COUNT": [],
-        "BEST-REPLY-REACTION": [],
-        "COMMENT-REPLY-COUNT": [],
-        "REACTION-COUNT": [],
-        "REACTION-AHAH": [],
-        "REACTION-LOVE": [],
-        "REACTION-CARE": [],
-        "REACTION-WOW": [],
-        "REACTION-SAD": [],
-        "REACTION-ANGER": [],
-        "REACTION-LIKE": [],
-    }
+    top_stats = {key: [] for key in STATS_KEYS}
     for user, user_stat in stats.items():
         for key in top_stats.keys():
             try:
@@ -7,6 +7,8 @@
 # Copyright (c) 2020 Arthur Dujardin
 
 
+import re
+from urllib.parse import urlparse
 from datetime import datetime, timedelta
 
 
@@ -34,6 +36,114 @@ def xpath_soup(element):
     return '/%s' % '/'.join(components)
 
 
+def get_post_id(url):
+    """Retrieve the ID of a post from its URL.
+
+    Args:
+        url (str): URL of the post (permalink or story).
+
+    Returns:
+        str: the ID of the post, or ``None`` if the URL does not point to a post.
+
+    Examples:
+        >>> get_post_id("https://m.facebook.com/groups/1234/permalink/745393222993590/")
+            '745393222993590'
+        >>> get_post_id("https://m.facebook.com/story.php?story_fbid=745393222993590&id=1234")
+            '745393222993590'
+    """
+    for pattern in [r"/permalink/(\d+)", r"story_fbid=(\d+)", r"multi_permalinks=(\d+)", r"/posts/(\d+)"]:
+        match = re.search(pattern, url)
+        if match:
+            return match.group(1)
+    return None
+
+
+def is_login_url(url):
+    """Check whether facebook redirected to its login or checkpoint page, e.g. because the session was rejected.
+
+    Args:
+        url (str): URL of the page.
+
+    Returns:
+        bool
+
+    Examples:
+        >>> is_login_url("https://m.facebook.com/login.php?next=https%3A%2F%2Fm.facebook.com%2Fcomment%2Freplies%2F")
+            True
+        >>> is_login_url("https://m.facebook.com/comment/replies/?ctoken=1_3")
+            False
+    """
+    path = urlparse(url or "").path
+    return path.startswith(("/login", "/checkpoint"))
+
+
+def parse_count(string):
+    """Convert a facebook counter to an integer.
+    Thousands separators (commas, spaces) are removed. A decimal point (or comma) is only read
+    when it is followed by a ``K`` or ``M`` suffix.
+
+    Args:
+        string (str): The counter displayed by facebook (e.g. ``"12"``, ``"1.2K"``).
+
+    Returns:
+        int: the count, or ``0`` if the string does not contain a counter.
+
+    Examples:
+        >>> parse_count("12")
+            12
+        >>> parse_count("1,234")
+            1234
+        >>> parse_count("12 345")
+            12345
+        >>> parse_count("1.2K")
+            1200
+        >>> parse_count("1,5 M")
+            1500000
+    """
+    string = string or ""
+    match = re.search(r"(\d+(?:[.,]\d+)?)\s*([KkMm])\b", string)
+    if match:
+        count = float(match.group(1).replace(",", "."))
+        return int(round(count * {"K": 1000, "M": 1000000}[match.group(2).upper()]))
+    match = re.search(r"\d{1,3}(?:[,.\s\u00a0\u202f]\d{3})+(?!\d)|\d+", string)
+    if not match:
+        return 0
+    return int(re.sub(r"\D", "", match.group(0)))
+
+
+def parse_reaction_summary(string):
+    """Convert the text of a reaction summary to the number of reactions.
+    The named users are counted, in addition to the ``"others"``.
+
+    Args:
+        string (str): The reaction summary displayed by facebook (e.g. ``"Jean and 3 others"``).
+
+    Returns:
+        int
+
+    Examples:
+        >>> parse_reaction_summary("Jean and 3 others")
+            4
+        >>> parse_reaction_summary("Jean, Léa and 1,234 others")
+            1236
+        >>> parse_reaction_summary("Jean and Léa")
+            2
+        >>> parse_reaction_summary("1.2K")
+            1200
+    """
+    string = (string or "").strip()
+    if not string:
+        return 0
+    match = re.fullmatch(r"(.+?),?\s+and\s+(.+?)\s+others?", string)
+    if match:
+        names = [name for name in re.split(r",\s*", match.group(1)) if name.strip()]
+        return len(names) + parse_count(match.group(2))
+    if re.fullmatch(r"[\d\s.,\u00a0\u202fKkMm]+", string):
+        return parse_count(string)
+    # Only named users
+    return len([name for name in re.split(r",\s*|\s+and\s+", string) if name.strip()])
+
+
 WEEK = {
     "Mon": "Monday",
     "Tue": "Tuesday",
@@ -0,0 +1,243 @@
+import pytest
+
+from halloffame.api import HallOfFameAPI
+from halloffame.parser import parse_permalink, parse_comment_page
+
+
+def comment(unique_id, user, inner="", sigil="comment"):
+    return (f'<div data-sigil="{sigil}" data-uniqueid="{unique_id}">'
+            f'<div class="_2b05"><a href="/{user}">{user}</a></div>'
+            f'<abbr>Aug 7, 2019</abbr><div data-sigil="comment-body">{unique_id}</div>{inner}</div>')
+
+
+def reply(unique_id, user):
+    return comment(unique_id, user, sigil="comment inline-reply")
+
+
+def see_prev(href):
+    return f'<div id="see_prev_1"><a href="{href}">View previous comments</a></div>'
+
+
+def more_replies(href):
+    return f'<a href="{href}">View 2 more replies</a>'
+
+
+def page(*items):
+    return "<html><body>" + "".join(items) + "</body></html>"
+
+
+REPLIES_HREF = "/comment/replies/?ctoken=1_3&p=1"
+
+# The post page shows the last comments, and the first reply of "c3".
+# Older comments are behind a chain of "View previous comments" pages, and the other replies of "c3"
+# behind a chain of "View more replies" pages. Some comments and replies are displayed on several pages.
+PERMALINK = page(
+    see_prev("/prev1"),
+    comment("c3", "user3", inner=reply("r31", "user31") + more_replies(REPLIES_HREF)),
+    comment("c4", "user4")
+)
+PAGES = {
+    "/prev1": page(see_prev("/prev2"), comment("c2", "user2"), comment("c3", "user3")),
+    "/prev2": page(comment("c1", "user1"), comment("c2", "user2")),
+    REPLIES_HREF: page(comment("c3", "user3"), reply("r31", "user31"), reply("r32", "user32"), see_prev("/replies2")),
+    "/replies2": page(reply("r32", "user32"), reply("r33", "user33")),
+}
+
+
+class FakeDriver:
+    page_source = ""
+    current_url = ""
+
+    def get(self, url):
+        self.page_source = PERMALINK
+
+    def find_elements_by_class_name(self, name):
+        return []
+
+
+@pytest.fixture
+def api():
+    # Bypass __init__, which starts a browser
+    api = HallOfFameAPI.__new__(HallOfFameAPI)
+    api.driver = FakeDriver()
+    api.reaction2href = {}
+    api.class2reaction = {}
+    api.extraction = "soup"
+    api.page_loads = 0
+    api.missing_pages = []
+    api.pages = dict(PAGES)
+    api.fetched = []
+
+    def fetch_pages(hrefs, workers=4):
+        api.fetched.append(list(hrefs))
+        return [api.pages.get(href) for href in hrefs]
+
+    api._fetch_pages = fetch_pages
+    return api
+
+
+def paginate(api, **budget):
+    permalink = parse_permalink(PERMALINK)
+    comments = api._paginate_comments(permalink["comments"], permalink["links"], **budget)
+    return [(comment["user"], [reply["user"] for reply in comment["replies"]]) for comment in comments]
+
+
+def test_parse_permalink_links():
+    permalink = parse_permalink(PERMALINK)
+    assert [comment["unique_id"] for comment in permalink["comments"]] == ["c3", "c4"]
+    assert permalink["links"] == [
+        {"href": "/prev1", "parent_id": None},
+        {"href": REPLIES_HREF, "parent_id": "c3"},
+    ]
+
+
+def test_parse_replies_page():
+    result = parse_comment_page(PAGES[REPLIES_HREF], parent_id="c3")
+    # The replied comment is displayed on the page, but is not one of its replies
+    assert [reply["unique_id"] for reply in result["comments"]] == ["r31", "r32"]
+    assert result["links"] == [{"href": "/replies2", "parent_id": "c3"}]
+
+
+def test_paginate_all(api):
+    assert paginate(api) == [
+        ("user3", ["user31", "user32", "user33"]),
+        ("user4", []),
+        ("user2", []),
+        ("user1", []),
+    ]
+    # The links are followed breadth-first
+    assert api.fetched == [["/prev1", REPLIES_HREF], ["/prev2", "/replies2"]]
+    assert api.missing_pages == []
+
+
+def test_paginate_duplicates(api):
+    comments = paginate(api)
+    users = [user for user, _ in comments]
+    assert len(users) == len(set(users))
+    for _, replies in comments:
+        assert len(replies) == len(set(replies))
+
+
+def test_paginate_duplicated_links(api):
+    permalink = parse_permalink(PERMALINK)
+    links = permalink["links"] + permalink["links"]
+    comments = permalink["comments"] + parse_permalink(PERMALINK)["comments"]
+    comments = api._paginate_comments(comments, links)
+    assert [comment["unique_id"] for comment in comments] == ["c3", "c4", "c2", "c1"]
+    assert api.fetched == [["/prev1", REPLIES_HREF], ["/prev2", "/replies2"]]
+
+
+def test_paginate_max_pages(api):
+    assert paginate(api, max_pages=1) == [("user3", ["user31"]), ("user4", []), ("user2", [])]
+    assert api.fetched == [["/prev1"]]
+
+
+def test_paginate_max_depth(api):
+    assert paginate(api, max_depth=1) == [("user3", ["user31", "user32"]), ("user4", []), ("user2", [])]
+    assert api.fetched == [["/prev1", REPLIES_HREF]]
+
+
+def test_paginate_max_comments(api):
+    # The post page already has 3 comments and replies, so only the first batch of pages is fetched
+    assert paginate(api, max_comments=4) == [("user3", ["user31", "user32"]), ("user4", []), ("user2", [])]
+    assert paginate(api, max_comments=3) == [("user3", ["user31"]), ("user4", [])]
+
+
+def test_paginate_without_replies(api):
+    assert paginate(api, replies=False) == [("user3", ["user31"]), ("user4", []), ("user2", []), ("user1", [])]
+    assert api.fetched == [["/prev1"], ["/prev2"]]
+
+
+def test_paginate_missing_pages(api):
+    del api.pages["/prev2"]
+    assert paginate(api) == [("user3", ["user31", "user32", "user33"]), ("user4", []), ("user2", [])]
+    assert api.missing_pages == ["/prev2"]
+
+
+@pytest.mark.parametrize("budget", [None, {"max_pages": 1}, {"max_depth": 1}, {"replies": False}])
+def test_pipelined_pagination(api, budget):
+    posts = [{"post_id": str(i), "group_id": "1", "user": "user", "user_id": "user", "date": "2020-01-01T00:00",
+              "text": ""} for i in range(2)]
+    expected = paginate(api, **(budget or {}))
+    posts = api._get_posts_pipelined(posts, mode="counts", comment_budget=budget, processes=1)
+    assert len(posts) == 2
+    for post in posts:
+        assert [(comment["user"], [reply["user"] for reply in comment["replies"]])
+                for comment in post["comments"]] == expected
+
+
+@pytest.fixture
+def http(api, monkeypatch):
+    """Serve the pages over a fake HTTP session. The paths in ``http.fail`` fail once, the ones in
+    ``http.broken`` always fail, and the ones in ``http.login`` are redirected to the login page."""
+    del api._fetch_pages
+    api.driver.get_cookies = lambda: [{"name": "c_user", "value": "1"}]
+    api.driver.execute_script = lambda script: "Mozilla"
+
+    class Response:
+        def __init__(self, url, page):
+            self.url = url
+            self.page = page
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            pass
+
+        def geturl(self):
+            return self.url
+
+        def read(self):
+            return self.page.encode("utf-8")
+
+    class HTTP:
+        def __init__(self):
+            self.attempts = []
+            self.fail = set()
+            self.broken = set()
+            self.login = set()
+
+        def urlopen(self, request, timeout=30):
+            href = request.full_url[len(HallOfFameAPI.BASE_URL):]
+            self.attempts.append(href)
+            if href in self.broken or (href in self.fail and self.attempts.count(href) == 1):
+                raise OSError("Connection reset")
+            if href in self.login:
+                return Response(f"{HallOfFameAPI.BASE_URL}/login.php?next={href}", page("<form>Log in</form>"))
+            return Response(request.full_url, api.pages[href])
+
+    http = HTTP()
+    monkeypatch.setattr("urllib.request.urlopen", http.urlopen)
+    return http
+
+
+def test_fetch_pages_retry_and_fallback(api, http):
+    http.fail.add("/prev1")
+    http.broken.add("/prev2")
+    # The driver loads the permalink page, whatever the link
+    assert api._fetch_pages(["/prev1", "/prev2"], workers=2) == [PAGES["/prev1"], PERMALINK]
+    assert http.attempts.count("/prev1") == 2
+    assert http.attempts.count("/prev2") == 2
+    # Each page is counted once, whether it was fetched with HTTP or with the driver
+    assert api.page_loads == 2
+
+
+def test_fetch_pages_login_redirect(api, http):
+    http.login.add("/prev1")
+    api.driver.current_url = f"{HallOfFameAPI.BASE_URL}/checkpoint/?next=1"
+    assert api._fetch_pages(["/prev1", "/prev2"]) == [None, PAGES["/prev2"]]
+    # The session is rejected, so the page is not fetched again
+    assert http.attempts.count("/prev1") == 1
+    assert api.page_loads == 2
+    permalink = parse_permalink(PERMALINK)
+    api._paginate_comments(permalink["comments"], permalink["links"], replies=False)
+    assert api.missing_pages == ["/prev1"]
+
+
+def test_fetch_pages_without_comments(api, http):
+    api.pages["/prev1"] = page("<div>Content not available</div>")
+    api.driver.current_url = HallOfFameAPI.BASE_URL
+    api.driver.page_source = api.pages["/prev1"]
+    api.driver.get = lambda url: None
+    assert api._fetch_pages(["/prev1"]) == [None]
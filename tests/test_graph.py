@@ -0,0 +1,43 @@
+from halloffame.graph import REACTIONS, InteractionGraph, get_graph_stats
+
+
+def post(user, reactions, comments=None):
+    return {
+        "user": user,
+        "reactions": [{"user": reactor, "reaction": reaction} for reactor, reaction in reactions],
+        "comments": comments or []
+    }
+
+
+POSTS = [
+    post("alice", [("bob", "LIKE"), ("carl", "AHAH")]),
+    post("alice", [("bob", "AHAH"), ("bob", "LIKE")]),
+    post("bob", [("alice", "LOVE")]),
+]
+
+
+def test_empty_graph():
+    # Posts retrieved with mode="counts", or a feed-only plan, have no reactions
+    posts = [{"user": "alice", "reactions": [], "reaction_count": 5, "comments": []}]
+    for graph_stats in [get_graph_stats(posts), get_graph_stats([])]:
+        assert set(graph_stats) == {"TOP-PAIR", "MUTUAL-PAIR", "BIGGEST-FAN", "RECIPROCITY",
+                                    *[f"BIGGEST-FAN-{reaction}" for reaction in REACTIONS]}
+        assert all(stats == [] for stats in graph_stats.values())
+
+
+def test_biggest_fans():
+    graph_stats = get_graph_stats(POSTS)
+    assert graph_stats["BIGGEST-FAN"] == [
+        {"user": "bob → alice", "reactor": "bob", "author": "alice", "count": 3},
+        {"user": "alice → bob", "reactor": "alice", "author": "bob", "count": 1},
+    ]
+    assert graph_stats["BIGGEST-FAN-LIKE"] == [{"user": "bob → alice", "reactor": "bob", "author": "alice", "count": 2}]
+    assert graph_stats["BIGGEST-FAN-LOVE"] == [{"user": "alice → bob", "reactor": "alice", "author": "bob", "count": 1}]
+    assert [fan["reactor"] for fan in graph_stats["BIGGEST-FAN-AHAH"]] in (["bob"], ["carl"])
+    assert graph_stats["BIGGEST-FAN-SAD"] == []
+
+
+def test_self_reactions():
+    posts = [post("alice", [("alice", "LIKE")])]
+    assert InteractionGraph.from_posts(posts).biggest_fans() == []
+    assert InteractionGraph.from_posts(posts, self_reactions=True).biggest_fans()[0]["count"] == 1
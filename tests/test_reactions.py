@@ -0,0 +1,38 @@
+import pytest
+
+from halloffame.api import HallOfFameAPI
+from halloffame.parser import parse_reactions
+
+
+class FakeDriver:
+    def __init__(self, results):
+        self.results = results
+
+    def execute_script(self, script):
+        return self.results.pop(0)
+
+
+def make_api(results):
+    # Bypass __init__, which starts a browser
+    api = HallOfFameAPI.__new__(HallOfFameAPI)
+    api.driver = FakeDriver(results)
+    api.class2reaction = {"sx_like": "LIKE"}
+    api._open_reactions = lambda post_id: 2
+    return api
+
+
+def test_extract_reactions():
+    api = make_api([{"rows": [["Alice", "alice", ["sx_like"]], ["Bob", "bob", ["sx_like"]]], "errors": []}])
+    assert api._resolve_reactions(api._extract_reactions("1")) == [
+        {"user": "Alice", "user_id": "alice", "reaction": "LIKE"},
+        {"user": "Bob", "user_id": "bob", "reaction": "LIKE"},
+    ]
+
+
+def test_extract_reactions_errors():
+    # Like the soup path, an item that cannot be extracted is an error, not a missing reaction
+    api = make_api([{"rows": [["Alice", "alice", ["sx_like"]]], "errors": ["TypeError: emoji is null"]}])
+    with pytest.raises(ValueError):
+        api._extract_reactions("1")
+    with pytest.raises(IndexError):
+        parse_reactions('<div><div class="item"><a href="/alice"><span><strong>Alice</strong></span></a></div></div>')
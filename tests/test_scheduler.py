@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from halloffame.scheduler import RefreshScheduler
+
+
+class FakeAPI:
+    page_loads = 0
+
+    def __init__(self, posts=None):
+        self.posts = posts
+
+    def list_posts(self, group_id, sleep=3, scroll_max=None, topk=-1):
+        if self.posts is None:
+            raise ConnectionError("No connection")
+        self.page_loads += 1
+        return self.posts
+
+
+def test_interval_grows_with_age(tmp_path):
+    scheduler = RefreshScheduler(FakeAPI(), ["1"], state_path=str(tmp_path / "state.json"))
+    now = datetime.now()
+    intervals = [scheduler._interval({"date": (now - timedelta(hours=hours)).isoformat()}, 0)
+                 for hours in range(0, 24 * 60)]
+    assert intervals[0] == pytest.approx(scheduler.min_interval)
+    assert all(previous <= interval for previous, interval in zip(intervals, intervals[1:]))
+    assert intervals[-1] == scheduler.max_interval
+
+
+def test_refresh_feed(tmp_path):
+    post = {"post_id": "10", "group_id": "1", "user": "alice", "user_id": "alice",
+            "date": datetime.now().isoformat(), "text": "", "reaction_count": 3}
+    scheduler = RefreshScheduler(FakeAPI([post]), ["1"], state_path=str(tmp_path / "state.json"))
+    assert scheduler.step()
+    assert scheduler.get_posts("1") == [{**post, "comments": [], "reactions": []}]
+    # The feed task and the new post are scheduled
+    assert sorted(str(post_id) for _, _, post_id in scheduler._queues["1"]) == ["10", "None"]
+    assert len(scheduler._loads) == 1
+
+
+def test_refresh_feed_failure(tmp_path):
+    scheduler = RefreshScheduler(FakeAPI(), ["1"], state_path=str(tmp_path / "state.json"))
+    assert scheduler.step()
+    # The feed task is scheduled again
+    assert [post_id for _, _, post_id in scheduler._queues["1"]] == [None]
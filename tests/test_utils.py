@@ -0,0 +1,35 @@
+import pytest
+
+from halloffame.utils import parse_count, parse_reaction_summary
+
+
+@pytest.mark.parametrize("string, count", [
+    ("12", 12),
+    ("1,234", 1234),
+    ("1.234", 1234),
+    ("12 345", 12345),
+    ("12 345", 12345),
+    ("1,234,567", 1234567),
+    ("1.2K", 1200),
+    ("1,5 M", 1500000),
+    ("3K", 3000),
+    ("", 0),
+    (None, 0),
+    ("No reactions", 0),
+])
+def test_parse_count(string, count):
+    assert parse_count(string) == count
+
+
+@pytest.mark.parametrize("string, count", [
+    ("Jean and 3 others", 4),
+    ("Jean and 1 other", 2),
+    ("Jean, Léa and 1,234 others", 1236),
+    ("Jean and 1.2K others", 1201),
+    ("Jean and Léa", 2),
+    ("Jean", 1),
+    ("1,234", 1234),
+    ("", 0),
+])
+def test_parse_reaction_summary(string, count):
+    assert parse_reaction_summary(string) == count